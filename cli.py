@@ -1,11 +1,18 @@
 import argparse
+import json
 import sys
 from typing import Dict
 
 import yaml
 
+from db import DatabaseUnavailable
+from queue_store.forward_retries import clear_forward_retries, init_forward_retries
+from queue_store.header_index import clear_header_index, get_study_headers, init_header_index
+from queue_store.pacs_pending import clear_pacs_pending, init_pacs_pending
 from queue_store.queue_manager import get_counts, get_study_rows, reset_queue
+from queue_store.results import clear_result_claims, init_result_claims
 from receiver.dicom_receiver import start_receiver
+from receiver.metrics import read_published
 
 
 FAULT_PRESETS: Dict[str, Dict[str, float | bool | int]] = {
@@ -38,10 +45,19 @@ def cmd_status(args: argparse.Namespace) -> None:
             return
         for row in rows:
             print(row)
+        headers = get_study_headers(args.study)
+        if headers:
+            print("headers:")
+            for header in headers:
+                print(header)
         return
     counts = get_counts()
     for state, count in counts.items():
         print(f"{state}: {count}")
+    published = read_published()
+    if published:
+        print("metrics:")
+        print(json.dumps(published, indent=2))
 
 
 def cmd_inject_fault(args: argparse.Namespace) -> None:
@@ -70,6 +86,14 @@ def cmd_clear_faults(_: argparse.Namespace) -> None:
 
 def cmd_reset_db(_: argparse.Namespace) -> None:
     reset_queue(reset_sequence=True)
+    init_header_index()
+    clear_header_index()
+    init_result_claims()
+    clear_result_claims()
+    init_pacs_pending()
+    clear_pacs_pending()
+    init_forward_retries()
+    clear_forward_retries()
     print("Database cleared and study sequence reset")
 
 
@@ -103,7 +127,10 @@ def main(argv: list[str]) -> None:
     if not hasattr(args, "func"):
         parser.print_help()
         raise SystemExit(2)
-    args.func(args)
+    try:
+        args.func(args)
+    except DatabaseUnavailable as exc:
+        raise SystemExit(str(exc)) from exc
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 import os
+import random
 import threading
 import time
-from typing import Optional
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
 
 import psycopg2
 from psycopg2 import OperationalError
+from psycopg2.pool import ThreadedConnectionPool
 
 from receiver.config import get_config, log_event
 
@@ -18,6 +22,29 @@ DEFAULTS = {
 }
 
 _CONN_LOCAL = threading.local()
+_POOL: Optional[ThreadedConnectionPool] = None
+_POOL_SLOTS: Optional[threading.BoundedSemaphore] = None
+_POOL_LOCK = threading.Lock()
+_STATS_LOCK = threading.Lock()
+_LAST_USED: Dict[int, float] = {}
+_STATS: Dict[str, Any] = {
+    "checkouts": 0,
+    "in_use": 0,
+    "waited": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+    "exhausted": 0,
+    "reconnects": 0,
+    "health_check_failures": 0,
+}
+
+
+class PoolExhaustedError(RuntimeError):
+    pass
+
+
+class DatabaseUnavailable(RuntimeError):
+    pass
 
 
 def _db_params() -> dict:
@@ -30,15 +57,28 @@ def _db_params() -> dict:
     }
 
 
-def _connect_with_retry(max_attempts: int = 10, delay_seconds: int = 2) -> psycopg2.extensions.connection:
-    params = _db_params()
+def _pool_settings() -> Dict[str, Any]:
+    return get_config().get("database", {}) or {}
+
+
+def backoff_delay(attempt: int) -> float:
+    settings = _pool_settings()
+    base = float(settings.get("backoff_base_seconds", 0.5))
+    cap = float(settings.get("backoff_max_seconds", 10))
+    delay = min(cap, base * (2 ** (attempt - 1)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _with_backoff(action: str, connect: Any, log_success: bool = True) -> Any:
     ae_title = get_config()["edge"]["ae_title"]
+    max_attempts = int(_pool_settings().get("connect_max_attempts", 10))
     last_error: Optional[str] = None
 
     for attempt in range(1, max_attempts + 1):
         try:
-            conn = psycopg2.connect(**params)
-            conn.autocommit = True
+            result = connect()
+            if not log_success and attempt == 1:
+                return result
             log_event(
                 "info",
                 "db",
@@ -46,13 +86,14 @@ def _connect_with_retry(max_attempts: int = 10, delay_seconds: int = 2) -> psyco
                 sop_uid=None,
                 ae_title=ae_title,
                 remote_ip=None,
-                outcome="connected",
+                outcome=action,
                 error=None,
             )
-            return conn
+            return result
         except OperationalError as exc:
             last_error = str(exc)
-            time.sleep(delay_seconds)
+            if attempt < max_attempts:
+                time.sleep(backoff_delay(attempt))
 
     log_event(
         "error",
@@ -64,13 +105,149 @@ def _connect_with_retry(max_attempts: int = 10, delay_seconds: int = 2) -> psyco
         outcome="connection_failed",
         error=last_error,
     )
-    raise SystemExit("PostgreSQL not ready")
+    raise DatabaseUnavailable(f"PostgreSQL not ready: {last_error}")
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    global _POOL, _POOL_SLOTS
+    if _POOL is not None:
+        return _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            settings = _pool_settings()
+            min_size = int(settings.get("pool_min", 2))
+            max_size = max(min_size, int(settings.get("pool_max", 20)))
+            _POOL = _with_backoff("connected", lambda: ThreadedConnectionPool(min_size, max_size, **_db_params()))
+            _POOL_SLOTS = threading.BoundedSemaphore(max_size)
+    return _POOL
+
+
+def _is_healthy(conn: psycopg2.extensions.connection) -> bool:
+    if conn.closed != 0:
+        return False
+    idle_limit = float(_pool_settings().get("health_check_idle_seconds", 30))
+    if time.monotonic() - _LAST_USED.get(id(conn), 0.0) < idle_limit:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def checkout() -> psycopg2.extensions.connection:
+    pool = _get_pool()
+    assert _POOL_SLOTS is not None
+    timeout = float(_pool_settings().get("checkout_timeout_seconds", 10))
+    started = time.monotonic()
+    if not _POOL_SLOTS.acquire(blocking=False):
+        with _STATS_LOCK:
+            _STATS["waited"] += 1
+        if not _POOL_SLOTS.acquire(timeout=timeout):
+            with _STATS_LOCK:
+                _STATS["exhausted"] += 1
+            raise PoolExhaustedError(f"db_pool_exhausted:{timeout}s")
+    waited = time.monotonic() - started
+
+    try:
+        conn = _with_backoff("reconnected", pool.getconn, log_success=False)
+        if not _is_healthy(conn):
+            with _STATS_LOCK:
+                _STATS["health_check_failures"] += 1
+                _STATS["reconnects"] += 1
+            _LAST_USED.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+            conn = _with_backoff("reconnected", pool.getconn)
+        conn.autocommit = True
+    except BaseException:
+        _POOL_SLOTS.release()
+        raise
+
+    with _STATS_LOCK:
+        _STATS["checkouts"] += 1
+        _STATS["in_use"] += 1
+        _STATS["wait_seconds_total"] += waited
+        _STATS["wait_seconds_max"] = max(_STATS["wait_seconds_max"], waited)
+    return conn
+
+
+def checkin(conn: psycopg2.extensions.connection) -> None:
+    pool = _get_pool()
+    if conn.closed == 0:
+        _LAST_USED[id(conn)] = time.monotonic()
+    else:
+        _LAST_USED.pop(id(conn), None)
+    try:
+        pool.putconn(conn, close=conn.closed != 0)
+    finally:
+        with _STATS_LOCK:
+            _STATS["in_use"] -= 1
+        if _POOL_SLOTS is not None:
+            _POOL_SLOTS.release()
+
+
+def connect_unpooled() -> psycopg2.extensions.connection:
+    conn = psycopg2.connect(**_db_params())
+    conn.autocommit = True
+    return conn
+
+
+@contextmanager
+def connection() -> Iterator[psycopg2.extensions.connection]:
+    conn = checkout()
+    try:
+        yield conn
+    finally:
+        checkin(conn)
 
 
 def get_connection() -> psycopg2.extensions.connection:
     conn: Optional[psycopg2.extensions.connection] = getattr(_CONN_LOCAL, "conn", None)
     if conn is not None and conn.closed == 0:
         return conn
-    conn = _connect_with_retry()
+    if conn is not None:
+        release_connection()
+    conn = checkout()
     _CONN_LOCAL.conn = conn
+    # Safety net for threads that exit without calling release_connection().
+    finalizer = weakref.finalize(threading.current_thread(), checkin, conn)
+    finalizer.atexit = False
+    _CONN_LOCAL.finalizer = finalizer
     return conn
+
+
+@contextmanager
+def transaction() -> Iterator[psycopg2.extensions.connection]:
+    conn = get_connection()
+    if not conn.autocommit:
+        yield conn
+        return
+    conn.autocommit = False
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        if conn.closed == 0:
+            conn.autocommit = True
+
+
+def release_connection() -> None:
+    finalizer = getattr(_CONN_LOCAL, "finalizer", None)
+    _CONN_LOCAL.conn = None
+    _CONN_LOCAL.finalizer = None
+    if finalizer is not None:
+        finalizer()
+
+
+def pool_stats() -> Dict[str, Any]:
+    settings = _pool_settings()
+    with _STATS_LOCK:
+        return {
+            "pool_min": int(settings.get("pool_min", 2)),
+            "pool_max": int(settings.get("pool_max", 20)),
+            **_STATS,
+        }
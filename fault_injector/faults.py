@@ -1,22 +1,40 @@
 import os
 import random
 import time
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
-from receiver.config import load_config
+from receiver.config import get_current_config
 
 
 class FaultError(RuntimeError):
     pass
 
 
+_ACTIVE_FAULTS: Tuple[Optional[Dict[str, Any]], Dict[str, Any]] = (None, {})
+
+
 def load_faults() -> Dict[str, Any]:
-    config = load_config()
-    return config.get("fault_injection", {})
+    global _ACTIVE_FAULTS
+    config = get_current_config()
+    parsed_from, faults = _ACTIVE_FAULTS
+    if parsed_from is config:
+        return faults
+    raw = config.get("fault_injection", {}) or {}
+    faults = {
+        "reject_all": bool(raw.get("reject_all")),
+        "disk_full": bool(raw.get("disk_full")),
+        "io_delay_ms": int(raw.get("io_delay_ms", 0) or 0),
+        "random_fail_rate": float(raw.get("random_fail_rate", 0.0) or 0.0),
+    }
+    faults = {name: value for name, value in faults.items() if value}
+    _ACTIVE_FAULTS = (config, faults)
+    return faults
 
 
 def apply_faults(stage: str) -> None:
     faults = load_faults()
+    if not faults:
+        return
     if faults.get("reject_all"):
         raise FaultError("reject_all")
 
@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from receiver.config import log_event
+
+
+class _Batch:
+    def __init__(self, now: float) -> None:
+        self.items: List[Any] = []
+        self.opened_at = now
+        self.last_added = now
+
+
+class StudyBatcher:
+    def __init__(
+        self,
+        name: str,
+        on_flush: Callable[[Hashable, List[Any]], None],
+        quiet_seconds: float,
+        max_batch: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self.name = name
+        self.quiet_seconds = max(0.0, quiet_seconds)
+        self.max_batch = max(1, max_batch)
+        self.max_wait_seconds = max(self.quiet_seconds, max_wait_seconds)
+        self._on_flush = on_flush
+        self._batches: Dict[Hashable, _Batch] = {}
+        self._full: List[tuple] = []
+        self._cond = threading.Condition()
+        self._stats = {"added": 0, "batches": 0, "flushed_full": 0, "flush_errors": 0, "max_batch_seen": 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def add(self, key: Hashable, item: Any) -> None:
+        now = time.monotonic()
+        with self._cond:
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch(now)
+            batch.items.append(item)
+            batch.last_added = now
+            self._stats["added"] += 1
+            if len(batch.items) >= self.max_batch:
+                # Detached right away: later instances for the key open a new batch
+                # instead of growing this one until the flusher wakes up.
+                del self._batches[key]
+                self._full.append((key, batch.items))
+            self._cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "open_batches": len(self._batches),
+                "pending_items": sum(len(batch.items) for batch in self._batches.values())
+                + sum(len(items) for _, items in self._full),
+                **self._stats,
+            }
+
+    def _deadline(self, batch: _Batch) -> float:
+        # Flush once the series goes quiet, but never hold the first instance longer than max_wait.
+        return min(batch.last_added + self.quiet_seconds, batch.opened_at + self.max_wait_seconds)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                due = self._take_due()
+                while not due:
+                    timeout = self._next_timeout()
+                    self._cond.wait(timeout)
+                    due = self._take_due()
+            for key, items in due:
+                try:
+                    self._on_flush(key, items)
+                except Exception as exc:  # noqa: BLE001
+                    with self._cond:
+                        self._stats["flush_errors"] += 1
+                    log_event(
+                        "error",
+                        self.name,
+                        study_uid=None,
+                        sop_uid=None,
+                        ae_title=None,
+                        remote_ip=None,
+                        outcome="flush_failed",
+                        batch_size=len(items),
+                        error=str(exc),
+                    )
+
+    def _take_due(self) -> List[tuple]:
+        # Caller holds self._cond.
+        now = time.monotonic()
+        due = list(self._full)
+        self._stats["flushed_full"] += len(self._full)
+        self._full = []
+        for key in [key for key, batch in self._batches.items() if self._deadline(batch) <= now]:
+            due.append((key, self._batches.pop(key).items))
+        for _, items in due:
+            self._stats["batches"] += 1
+            self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(items))
+        return due
+
+    def _next_timeout(self) -> Optional[float]:
+        # Caller holds self._cond.
+        if not self._batches:
+            return None
+        return max(0.0, min(self._deadline(batch) for batch in self._batches.values()) - time.monotonic())
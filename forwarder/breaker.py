@@ -0,0 +1,133 @@
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from forwarder.retry import RetryScheduler
+from receiver.config import log_event
+
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], bool],
+        probes: RetryScheduler,
+        failure_threshold: int,
+        open_seconds: float,
+        max_open_seconds: float,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = max(0.1, open_seconds)
+        self.max_open_seconds = max(self.open_seconds, max_open_seconds)
+        self._probe = probe
+        self._probes = probes
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._probe_delay = self.open_seconds
+        self._trial_in_flight = False
+        self._opened_at: float | None = None
+        self._stats = {"opened": 0, "rejected": 0, "probes": 0, "probe_failures": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def available(self) -> bool:
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            return self._state == STATE_HALF_OPEN and not self._trial_in_flight
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def release_trial(self) -> None:
+        # A half-open trial that never reached the destination proves nothing either way.
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            previous = self._state
+            self._state = STATE_CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            self._probe_delay = self.open_seconds
+            self._opened_at = None
+        if previous != STATE_CLOSED:
+            self._log_transition(previous, STATE_CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            previous = self._state
+            if previous == STATE_OPEN:
+                return
+            if previous == STATE_CLOSED and self._consecutive_failures < self.failure_threshold:
+                return
+            self._trip()
+        self._log_transition(previous, STATE_OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_for = round(time.monotonic() - self._opened_at, 1) if self._opened_at is not None else None
+            return {
+                "destination": self.name,
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "open_for_seconds": open_for,
+                **self._stats,
+            }
+
+    def probe(self) -> None:
+        with self._lock:
+            if self._state != STATE_OPEN:
+                return
+            self._stats["probes"] += 1
+        ok = self._probe()
+        with self._lock:
+            if self._state != STATE_OPEN:
+                return
+            if not ok:
+                self._stats["probe_failures"] += 1
+                self._probe_delay = min(self._probe_delay * 2, self.max_open_seconds)
+                self._probes.schedule(self._probe_delay, self)
+                return
+            self._state = STATE_HALF_OPEN
+            self._trial_in_flight = False
+        self._log_transition(STATE_OPEN, STATE_HALF_OPEN)
+
+    def _trip(self) -> None:
+        # Caller holds self._lock.
+        self._state = STATE_OPEN
+        self._trial_in_flight = False
+        self._opened_at = time.monotonic()
+        self._stats["opened"] += 1
+        self._probes.schedule(self._probe_delay, self)
+
+    def _log_transition(self, previous: str, current: str) -> None:
+        log_event(
+            "warning" if current == STATE_OPEN else "info",
+            "breaker",
+            study_uid=None,
+            sop_uid=None,
+            ae_title=None,
+            remote_ip=None,
+            destination=self.name,
+            outcome=f"{previous}->{current}",
+        )
@@ -0,0 +1,340 @@
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from receiver.config import log_event
+
+
+_Entry = Tuple[Callable[..., Any], tuple, float]
+
+
+class _FairQueue:
+    # Deficit round-robin across flows (calling AEs): each visit a flow earns its
+    # weight in credit and spends one per task, so a bulk sender only gets its share.
+    def __init__(self, weights: Dict[str, float], default_weight: float) -> None:
+        self._weights = weights
+        self._default_weight = default_weight
+        self._flows: Dict[str, Deque[_Entry]] = {}
+        self._deficit: Dict[str, float] = {}
+        self._active: Deque[str] = deque()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, flow: str, entry: _Entry) -> None:
+        queue = self._flows.get(flow)
+        if queue is None:
+            queue = self._flows[flow] = deque()
+            self._deficit[flow] = 0.0
+            self._active.append(flow)
+        queue.append(entry)
+        self._size += 1
+
+    def oldest(self) -> float:
+        return min(queue[0][2] for queue in self._flows.values())
+
+    def depths(self) -> Dict[str, int]:
+        return {flow: len(queue) for flow, queue in self._flows.items()}
+
+    def pop(self) -> Tuple[str, _Entry]:
+        while True:
+            flow = self._active[0]
+            if self._deficit[flow] < 1.0:
+                self._deficit[flow] += self._weights.get(flow, self._default_weight)
+                if self._deficit[flow] < 1.0:
+                    self._active.rotate(-1)
+                    continue
+            queue = self._flows[flow]
+            entry = queue.popleft()
+            self._size -= 1
+            self._deficit[flow] -= 1.0
+            if not queue:
+                self._active.popleft()
+                del self._flows[flow]
+                del self._deficit[flow]
+            elif self._deficit[flow] < 1.0:
+                self._active.rotate(-1)
+            return flow, entry
+
+
+class BoundedExecutor:
+    def __init__(
+        self,
+        name: str,
+        pool_size: int,
+        queue_depth: int,
+        lanes: Optional[List[str]] = None,
+        default_lane: Optional[str] = None,
+        starvation_seconds: float = 10.0,
+        flow_weights: Optional[Dict[str, float]] = None,
+        default_flow_weight: float = 1.0,
+    ) -> None:
+        self.name = name
+        self.pool_size = max(1, pool_size)
+        self.queue_depth = max(1, queue_depth)
+        # Lanes are served highest first; a lower lane whose head has waited
+        # starvation_seconds gets every other slot until it catches up.
+        self.lanes = list(lanes or ["default"])
+        # Unknown or missing lanes land here; callers pass the classifier's default.
+        self.default_lane = default_lane if default_lane in self.lanes else self.lanes[-1]
+        self.starvation_seconds = max(0.0, starvation_seconds)
+        weights = {str(flow): max(0.01, float(weight)) for flow, weight in (flow_weights or {}).items()}
+        default_weight = max(0.01, default_flow_weight)
+        self._pending: Dict[str, _FairQueue] = {lane: _FairQueue(weights, default_weight) for lane in self.lanes}
+        self._flow_stats: Dict[str, Dict[str, int]] = {}
+        self._queued = 0
+        self._last_aged = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._active = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "errors": 0,
+            "rejected": 0,
+            "blocked": 0,
+            "blocked_seconds": 0.0,
+            "max_queued": 0,
+            "wait_seconds_total": 0.0,
+        }
+        self._lane_stats = {
+            lane: {"submitted": 0, "served": 0, "aged": 0, "wait_seconds_total": 0.0, "max_wait_seconds": 0.0}
+            for lane in self.lanes
+        }
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{idx}", daemon=True)
+            for idx in range(self.pool_size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        lane: Optional[str] = None,
+        flow: Optional[str] = None,
+    ) -> bool:
+        lane = lane if lane in self._pending else self.default_lane
+        flow = flow or ""
+        with self._lock:
+            if self._queued >= self.queue_depth:
+                if not block:
+                    self._stats["rejected"] += 1
+                    return False
+                self._stats["blocked"] += 1
+                started = time.monotonic()
+                deadline = None if timeout is None else started + timeout
+                while self._queued >= self.queue_depth:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._stats["blocked_seconds"] += time.monotonic() - started
+                        self._stats["rejected"] += 1
+                        return False
+                    self._not_full.wait(remaining)
+                self._stats["blocked_seconds"] += time.monotonic() - started
+            self._pending[lane].push(flow, (fn, args, time.monotonic()))
+            self._flow_stats.setdefault(flow, {"submitted": 0, "served": 0})["submitted"] += 1
+            self._queued += 1
+            self._stats["submitted"] += 1
+            self._lane_stats[lane]["submitted"] += 1
+            self._stats["max_queued"] = max(self._stats["max_queued"], self._queued)
+            self._not_empty.notify()
+        return True
+
+    def has_capacity(self, reserve: int = 0) -> bool:
+        with self._lock:
+            return self._queued + reserve < self.queue_depth
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {
+                "pool_size": self.pool_size,
+                "active": self._active,
+                "utilisation": round(self._active / self.pool_size, 3),
+                "queued": self._queued,
+                "queue_depth": self.queue_depth,
+                **self._stats,
+            }
+            if len(self.lanes) > 1:
+                now = time.monotonic()
+                result["lanes"] = {
+                    lane: {
+                        "depth": len(self._pending[lane]),
+                        "oldest_wait_seconds": round(now - self._pending[lane].oldest(), 3) if self._pending[lane] else 0.0,
+                        "avg_wait_ms": round(1000.0 * stats["wait_seconds_total"] / stats["served"], 1) if stats["served"] else None,
+                        **{key: round(value, 3) if isinstance(value, float) else value for key, value in stats.items()},
+                    }
+                    for lane, stats in self._lane_stats.items()
+                }
+            if any(self._flow_stats):
+                depths: Dict[str, int] = {}
+                for queue in self._pending.values():
+                    for flow, depth in queue.depths().items():
+                        depths[flow] = depths.get(flow, 0) + depth
+                result["flows"] = {
+                    flow or "-": {"depth": depths.get(flow, 0), **stats}
+                    for flow, stats in self._flow_stats.items()
+                }
+            return result
+
+    def _take(self) -> Tuple[Callable[..., Any], tuple]:
+        # Caller holds self._lock and has checked that something is queued.
+        now = time.monotonic()
+        lane = next(lane for lane in self.lanes if self._pending[lane])
+        starving = [
+            other
+            for other in self.lanes[self.lanes.index(lane) + 1:]
+            if self._pending[other] and now - self._pending[other].oldest() >= self.starvation_seconds
+        ]
+        aged = bool(starving) and not self._last_aged
+        self._last_aged = aged
+        if aged:
+            lane = min(starving, key=lambda other: self._pending[other].oldest())
+        flow, (fn, args, enqueued_at) = self._pending[lane].pop()
+        self._flow_stats[flow]["served"] += 1
+        self._queued -= 1
+        waited = now - enqueued_at
+        lane_stats = self._lane_stats[lane]
+        lane_stats["served"] += 1
+        lane_stats["aged"] += int(aged)
+        lane_stats["wait_seconds_total"] += waited
+        lane_stats["max_wait_seconds"] = max(lane_stats["max_wait_seconds"], waited)
+        self._stats["wait_seconds_total"] += waited
+        return fn, args
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queued:
+                    self._not_empty.wait()
+                fn, args = self._take()
+                self._active += 1
+                self._not_full.notify()
+            try:
+                fn(*args)
+                outcome = "completed"
+            except Exception as exc:  # noqa: BLE001
+                outcome = "errors"
+                log_event(
+                    "error",
+                    self.name,
+                    study_uid=None,
+                    sop_uid=None,
+                    ae_title=None,
+                    remote_ip=None,
+                    outcome="task_failed",
+                    error=str(exc),
+                )
+            with self._lock:
+                self._active -= 1
+                self._stats[outcome] += 1
+
+
+class DispatchSpool:
+    def __init__(self, spool_dir: str) -> None:
+        self.spool_dir = spool_dir
+        os.makedirs(spool_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = {"spilled": 0, "redriven": 0}
+        # Claims are tagged with a token unique to this start, not the PID: in a
+        # container the PID repeats across restarts. The token's owner file stays
+        # flocked while this process lives, so a claim is stale once its lock is free.
+        self._token = uuid.uuid4().hex
+        self._owner = open(os.path.join(spool_dir, f".owner-{self._token}"), "w")
+        fcntl.flock(self._owner, fcntl.LOCK_EX)
+        self._release_stale_claims()
+
+    def spill(self, key: str, payload: Dict[str, Any]) -> None:
+        path = os.path.join(self.spool_dir, f"{key}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._stats["spilled"] += 1
+
+    def redrive(self, submit: Callable[[Dict[str, Any]], bool]) -> int:
+        names = [name for name in os.listdir(self.spool_dir) if name.endswith(".json")]
+        names.sort(key=lambda name: self._mtime(os.path.join(self.spool_dir, name)))
+        redriven = 0
+        for name in names:
+            path = os.path.join(self.spool_dir, name)
+            # Every receiver process shares the spool; the rename makes exactly one
+            # of them own a file before it is submitted.
+            claimed_path = f"{path}.claimed-{self._token}"
+            try:
+                os.rename(path, claimed_path)
+            except FileNotFoundError:
+                continue
+            try:
+                with open(claimed_path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                os.rename(claimed_path, path)
+                continue
+            if not submit(payload):
+                os.rename(claimed_path, path)
+                break
+            os.remove(claimed_path)
+            redriven += 1
+        with self._lock:
+            self._stats["redriven"] += redriven
+        return redriven
+
+    def _release_stale_claims(self) -> None:
+        # Claims left by a process that died between rename and submit go back
+        # to the spool, then the dead owners' lock files are dropped.
+        names = os.listdir(self.spool_dir)
+        dead = {
+            name[len(".owner-"):]
+            for name in names
+            if name.startswith(".owner-") and name != f".owner-{self._token}" and not self._owner_alive(name)
+        }
+        for name in names:
+            base, sep, token = name.rpartition(".claimed-")
+            if not sep or token == self._token or (token not in dead and self._owner_alive(f".owner-{token}")):
+                continue
+            try:
+                os.rename(os.path.join(self.spool_dir, name), os.path.join(self.spool_dir, base))
+            except FileNotFoundError:
+                pass
+        for token in dead:
+            try:
+                os.remove(os.path.join(self.spool_dir, f".owner-{token}"))
+            except FileNotFoundError:
+                pass
+
+    def _owner_alive(self, owner_name: str) -> bool:
+        try:
+            with open(os.path.join(self.spool_dir, owner_name), "r") as f:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return True
+                fcntl.flock(f, fcntl.LOCK_UN)
+                return False
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except FileNotFoundError:
+            return 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        depth = len([name for name in os.listdir(self.spool_dir) if name.endswith(".json")])
+        with self._lock:
+            return {"depth": depth, **self._stats}
+
@@ -1,22 +1,45 @@
 import os
+import random
 import shutil
+import threading
 import time
-from itertools import cycle
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-import pydicom
-from pynetdicom import AE
-from pynetdicom.sop_class import CTImageStorage, MRImageStorage, SecondaryCaptureImageStorage
+from pynetdicom import _config
 
+from db import backoff_delay, release_connection
 from fault_injector.faults import FaultError, apply_faults, simulate_disk_full
-from queue_store.models import STATE_FAILED, STATE_FORWARDING, STATE_QUEUED, STATE_SENT
-from queue_store.queue_manager import get_next_queued, increment_retry, mark_worker_sent, update_state
+from forwarder.breaker import CircuitBreaker
+from forwarder.dispatch import BoundedExecutor
+from forwarder.pool import AssociationError, AssociationPool
+from forwarder.priority import PriorityRules
+from forwarder.ratelimit import TokenBucket
+from forwarder.retry import RetryScheduler
+from forwarder.rules import Route, get_routing_table
+from forwarder.scheduler import SchedulerError, WorkerScheduler, WorkerState
+from queue_store.header_index import get_header
+from queue_store.models import STATE_FAILED, STATE_FORWARDING, STATE_SENT
+from queue_store import write_behind
+from queue_store.notify import QueueListener, notify_channel
+from queue_store.queue_manager import mark_worker_sent, update_state
+from queue_store.transitions import claim_queued, defer_forward_retry, notify_queued, record_forward_failure
+from receiver import metrics
 from receiver.config import get_config, log_event
+from receiver.storage import read_header
 
 
 class ForwardError(RuntimeError):
     pass
 
 
+class _HedgeRace:
+    def __init__(self) -> None:
+        self.cond = threading.Condition()
+        self.primary_done = False
+        self.hedge_state: str | None = None
+        self.hedge_worker: WorkerState | None = None
+
+
 class Forwarder:
     def __init__(self) -> None:
         self.config = get_config()
@@ -27,55 +50,150 @@ class Forwarder:
         self.max_retries = int(forwarder_config["max_retries"])
         self.backoff_base = int(forwarder_config["backoff_base_seconds"])
         self.poll_interval = int(forwarder_config["poll_interval_seconds"])
+        self.claim_batch_size = int(forwarder_config.get("claim_batch_size", 8))
+        self._priority = PriorityRules(forwarder_config.get("priority", {}))
+        self.retry_jitter = min(1.0, max(0.0, float(forwarder_config.get("retry_jitter", 0.2))))
+        # Wakes the consumers when a retry is due; claim_queued does the requeue.
+        self._retries = RetryScheduler("forward_retry", notify_queued)
+        self.consumers = max(1, int(forwarder_config.get("consumers", 4)))
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._sent_meter = metrics.RateMeter()
+        self._failed_meter = metrics.RateMeter()
         self.worker_timeout_seconds = float(forwarder_config.get("worker_timeout_seconds", 10))
         self.data_root = self.config["edge"]["data_root"]
         self.orthanc = forwarder_config.get("orthanc", {})
         self.workers = forwarder_config.get("workers", [])
         if self.mode in {"workers", "gateway"} and not self.workers:
             raise ValueError("Workers mode enabled but no worker targets configured")
-        self._worker_cycle = cycle(self.workers) if self.workers else None
+        # Invalid routing rules fail at startup rather than on the first instance.
+        get_routing_table()
+        self._scheduler = (
+            WorkerScheduler(
+                self.workers,
+                default_timeout_s=self.worker_timeout_seconds,
+                policy=str(forwarder_config.get("worker_selection", "p2c")).lower(),
+                ewma_alpha=float(forwarder_config.get("latency_ewma_alpha", 0.2)),
+                is_available=self._worker_available,
+                affinity_load_factor=float(forwarder_config.get("affinity_load_factor", 1.25)),
+                adaptive_timeout=forwarder_config.get("adaptive_timeout", {}),
+            )
+            if self.workers
+            else None
+        )
+        self.pool_config = forwarder_config.get("association_pool", {})
+        _config.STORE_SEND_CHUNKED_DATASET = bool(forwarder_config.get("send_chunked", True))
+        self.breaker_config = forwarder_config.get("circuit_breaker", {})
+        self._pools: Dict[Tuple[str, int, str], AssociationPool] = {}
+        self._breakers: Dict[Tuple[str, int, str], CircuitBreaker] = {}
+        self.rate_limit_config = forwarder_config.get("destination_rate_limit", {})
+        self._rate_limits: Dict[Tuple[str, int, str], TokenBucket] = {}
+        self._pools_lock = threading.Lock()
+        self._breaker_probes = RetryScheduler("breaker_probe", lambda breaker: breaker.probe())
+        hedging_config = forwarder_config.get("hedging", {})
+        self.hedging_enabled = bool(hedging_config.get("enabled", False)) and len(self.workers) > 1
+        self.hedge_percentile = float(hedging_config.get("percentile", 0.95))
+        self._hedge_timer: RetryScheduler | None = None
+        self._hedge_executor: BoundedExecutor | None = None
+        if self.hedging_enabled:
+            self._hedge_timer = RetryScheduler("worker_hedge_timer", lambda payload: self._launch_hedge(*payload))
+            self._hedge_executor = BoundedExecutor(
+                "worker_hedge",
+                pool_size=int(hedging_config.get("pool_size", 4)),
+                queue_depth=int(hedging_config.get("queue_depth", 64)),
+            )
+        self._hedge_stats = {"armed": 0, "launched": 0, "skipped": 0, "hedge_acked_first": 0, "rescued": 0}
+        self._hedge_lock = threading.Lock()
 
     def run(self) -> None:
-        while True:
-            if self.mode == "parallel":
-                time.sleep(self.poll_interval)
-                continue
-            item = get_next_queued()
-            if item is None:
+        if self.mode == "parallel":
+            while True:
                 time.sleep(self.poll_interval)
-                continue
-
+        listener = QueueListener(notify_channel())
+        metrics.register("queue_listener", listener.stats)
+        metrics.register("forward_retry", self._retries.stats)
+        metrics.register("forwarder", self.stats)
+        for idx in range(1, self.consumers):
+            threading.Thread(target=self._consume, args=(listener,), name=f"forwarder-{idx}", daemon=True).start()
+        self._consume(listener)
+
+    def _consume(self, listener: QueueListener) -> None:
+        failures = 0
+        while True:
+            # A lost database or exhausted pool must not end the consumer thread:
+            # log, back off and claim again. Items claimed before the error stay
+            # in STATE_FORWARDING until the next startup recovery.
             try:
-                queued_path = self._move_to_queued(item.file_path, item.study_uid, item.sop_uid)
-                update_state(item.id, STATE_FORWARDING, file_path=queued_path)
-                item.file_path = queued_path
-
-                apply_faults("forward")
-                time.sleep(0.2)
+                items = claim_queued(self.claim_batch_size, self._priority.lanes, self._priority.starvation_seconds)
+                if not items:
+                    failures = 0
+                    listener.wait(self.poll_interval)
+                    continue
+                for item in items:
+                    with self._in_flight_lock:
+                        self._in_flight += 1
+                    try:
+                        self._forward_item(item)
+                    finally:
+                        with self._in_flight_lock:
+                            self._in_flight -= 1
+                failures = 0
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                release_connection()
+                log_event(
+                    "error",
+                    "forward",
+                    study_uid=None,
+                    sop_uid=None,
+                    ae_title=self.config["edge"]["ae_title"],
+                    remote_ip=None,
+                    outcome="consumer_error",
+                    error=str(exc),
+                )
+                time.sleep(backoff_delay(min(failures, 6)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._in_flight_lock:
+            in_flight = self._in_flight
+        return {
+            "mode": self.mode,
+            "consumers": self.consumers,
+            "in_flight": in_flight,
+            "sent": self._sent_meter.stats(),
+            "failed": self._failed_meter.stats(),
+        }
 
-                destination = self.mode
-                if self.mode == "workers":
-                    self.send_to_worker(queued_path, item.id)
-                elif self.mode == "orthanc":
+    def _forward_item(self, item) -> None:
+        try:
+            queued_path = self._move_to_queued(item.file_path, item.study_uid, item.sop_uid)
+            update_state(item.id, STATE_FORWARDING, file_path=queued_path)
+            item.file_path = queued_path
+
+            apply_faults("forward")
+
+            destination = self.mode
+            if self.mode == "workers":
+                self.send_to_worker(queued_path, item.id, item.study_uid)
+            elif self.mode == "orthanc":
+                self.send_to_orthanc(queued_path)
+            elif self.mode == "gateway":
+                route = self._determine_route(item)
+                if route.destination == "workers":
+                    self.send_to_worker(queued_path, item.id, item.study_uid, route.workers)
+                    destination = "worker"
+                else:
                     self.send_to_orthanc(queued_path)
-                elif self.mode == "gateway":
-                    route = self._determine_route(queued_path)
-                    if route == "worker":
-                        self.send_to_worker(queued_path, item.id)
-                        destination = "worker"
-                    elif route == "orthanc":
-                        self.send_to_orthanc(queued_path)
-                        destination = "orthanc"
-                    else:
-                        raise ForwardError(f"unknown_route:{route}")
-
-                sent_path = self._move_to_sent(queued_path, item.study_uid, item.sop_uid)
-                update_state(item.id, STATE_SENT, file_path=sent_path)
-                self._log_forward(item.study_uid, item.sop_uid, result="sent", error=None, destination=destination)
-            except (FaultError, OSError, ForwardError) as exc:
-                self._handle_failure(item, str(exc))
-            except Exception as exc:  # noqa: BLE001
-                self._handle_failure(item, str(exc))
+                    destination = "orthanc"
+
+            sent_path = self._move_to_sent(queued_path, item.study_uid, item.sop_uid)
+            update_state(item.id, STATE_SENT, file_path=sent_path)
+            self._sent_meter.mark()
+            self._log_forward(item.study_uid, item.sop_uid, result="sent", error=None, destination=destination)
+        except (FaultError, OSError, ForwardError) as exc:
+            self._handle_failure(item, str(exc))
+        except Exception as exc:  # noqa: BLE001
+            self._handle_failure(item, str(exc))
 
     def _move_to_queued(self, source_path: str, study_uid: str, sop_uid: str) -> str:
         dest_dir = os.path.join(self.data_root, "queued", study_uid)
@@ -102,125 +220,374 @@ class Forwarder:
         return dest_path
 
     def send_to_orthanc(self, source_path: str) -> None:
-        host = str(self.orthanc.get("host", "orthanc"))
-        port = int(self.orthanc.get("port", 4242))
-        called_aet = str(self.orthanc.get("ae_title", "ORTHANC"))
-        timeout_s = float(self.orthanc.get("timeout_s", 10))
-
-        ae = AE(ae_title=self.config["edge"]["ae_title"])
-        ae.add_requested_context(CTImageStorage)
-        ae.add_requested_context(MRImageStorage)
-        ae.add_requested_context(SecondaryCaptureImageStorage)
-        ae.acse_timeout = timeout_s
-        ae.dimse_timeout = timeout_s
-        ae.network_timeout = timeout_s
-
+        self._send(self._orthanc_pool(), source_path, error_prefix="")
+
+    def send_batch_to_orthanc(self, source_paths: List[str]) -> List[str | None]:
+        return self._send_many(self._orthanc_pool(), source_paths, error_prefix="")
+
+    def _orthanc_pool(self) -> AssociationPool:
+        return self._pool_for(self.orthanc, "orthanc", 4242, "ORTHANC", float(self.orthanc.get("timeout_s", 10)))
+
+    def send_to_worker(
+        self,
+        source_path: str,
+        item_id: int,
+        study_uid: str | None = None,
+        workers: Optional[FrozenSet[str]] = None,
+    ) -> dict:
+        if self._scheduler is None:
+            raise ForwardError("workers_unconfigured")
         try:
-            assoc = ae.associate(host, port, ae_title=called_aet)
-        except TimeoutError as exc:
-            raise ForwardError("timeout") from exc
-        except Exception as exc:  # noqa: BLE001
-            message = str(exc)
-            if "timed out" in message.lower():
-                raise ForwardError("timeout") from exc
-            raise ForwardError(f"association_error:{message}") from exc
-
-        if not assoc.is_established:
-            raise ForwardError("association_refused")
+            worker = self._scheduler.acquire(self.worker_timeout_seconds, affinity_key=study_uid, only=workers)
+        except SchedulerError as exc:
+            raise ForwardError(str(exc)) from exc
+        write_behind.submit(mark_worker_sent, item_id, worker.host, worker.ae_title)
+
+        race = None
+        hedge_delay = self._scheduler.latency_percentile(worker, self.hedge_percentile) if self.hedging_enabled else None
+        if hedge_delay is not None:
+            # If the first worker has not acknowledged by its p95, the same instance
+            # goes to a second worker; the receiver keeps whichever AI_RESULT lands first.
+            race = _HedgeRace()
+            self._count_hedge("armed")
+            self._hedge_timer.schedule(hedge_delay, (race, source_path, study_uid, worker, workers))
 
         try:
-            ds = pydicom.dcmread(source_path)
-            status = assoc.send_c_store(ds)
-        except TimeoutError as exc:
-            raise ForwardError("timeout") from exc
-        except Exception as exc:  # noqa: BLE001
-            raise ForwardError(f"c_store_error:{exc}") from exc
+            self._send_to(worker, source_path)
+        except ForwardError:
+            if race is None:
+                raise
+            hedge_worker = self._finish_race(race, primary_ok=False)
+            if hedge_worker is None:
+                raise
+            self._count_hedge("rescued")
+            return self._describe(hedge_worker)
+        if race is not None:
+            self._finish_race(race, primary_ok=True)
+        return self._describe(worker)
+
+    def send_batch_to_worker(
+        self,
+        source_paths: List[str],
+        item_ids: List[int],
+        study_uid: str | None = None,
+        workers: Optional[FrozenSet[str]] = None,
+    ) -> Tuple[dict, List[str | None]]:
+        if self._scheduler is None:
+            raise ForwardError("workers_unconfigured")
+        try:
+            worker = self._scheduler.acquire(self.worker_timeout_seconds, affinity_key=study_uid, only=workers)
+        except SchedulerError as exc:
+            raise ForwardError(str(exc)) from exc
+        for item_id in item_ids:
+            write_behind.submit(mark_worker_sent, item_id, worker.host, worker.ae_title)
+
+        started = time.monotonic()
+        errors: List[str | None] = ["worker_batch_error"]
+        timeout_s = self._scheduler.timeout_for(worker)
+        try:
+            pool = self._pool_for(worker.target, worker.host, worker.port, worker.ae_title, worker.timeout_s)
+            errors = self._send_many(pool, source_paths, error_prefix="worker_", timeout_s=timeout_s)
         finally:
-            assoc.release()
-
-        if status is None:
-            raise ForwardError("c_store_no_status")
-        status_code = getattr(status, "Status", None)
-        if status_code != 0x0000:
-            raise ForwardError(f"c_store_failure:{status_code}")
+            # Latency is tracked per instance so batches do not skew timeouts or selection.
+            per_instance = (time.monotonic() - started) / max(1, len(source_paths))
+            timed_out = "worker_timeout" in errors
+            self._scheduler.release(worker, per_instance, not all(errors), timeout_s if timed_out else None)
+        return self._describe(worker), errors
+
+    def _send_to(self, worker: WorkerState, source_path: str) -> None:
+        started = time.monotonic()
+        ok = False
+        timed_out_after = None
+        timeout_s = self._scheduler.timeout_for(worker)
+        try:
+            pool = self._pool_for(worker.target, worker.host, worker.port, worker.ae_title, worker.timeout_s)
+            self._send(pool, source_path, error_prefix="worker_", timeout_s=timeout_s)
+            ok = True
+        except ForwardError as exc:
+            if str(exc) == "worker_timeout":
+                timed_out_after = timeout_s
+            raise
+        finally:
+            self._scheduler.release(worker, time.monotonic() - started, ok, timed_out_after)
 
-    def send_to_worker(self, source_path: str, item_id: int) -> dict:
-        if not self._worker_cycle:
-            raise ForwardError("workers_unconfigured")
-        worker = next(self._worker_cycle)
-        host = str(worker.get("host"))
-        port = int(worker.get("port", 11112))
-        called_aet = str(worker.get("ae_title", "WORKER"))
-        timeout_s = float(worker.get("timeout_s", self.worker_timeout_seconds))
-        mark_worker_sent(item_id, host, called_aet)
-
-        ae = AE(ae_title=self.config["edge"]["ae_title"])
-        ae.add_requested_context(CTImageStorage)
-        ae.add_requested_context(MRImageStorage)
-        ae.add_requested_context(SecondaryCaptureImageStorage)
-        ae.acse_timeout = timeout_s
-        ae.dimse_timeout = timeout_s
-        ae.network_timeout = timeout_s
+    @staticmethod
+    def _describe(worker: WorkerState) -> dict:
+        return {
+            "host": worker.host,
+            "port": worker.port,
+            "ae_title": worker.ae_title,
+        }
 
+    def _launch_hedge(
+        self,
+        race: _HedgeRace,
+        source_path: str,
+        study_uid: str | None,
+        primary: WorkerState,
+        workers: Optional[FrozenSet[str]],
+    ) -> None:
+        with race.cond:
+            if race.primary_done:
+                return
+            race.hedge_state = "pending"
+        if not self._hedge_executor.submit(self._run_hedge, race, source_path, study_uid, primary, workers, block=False):
+            self._count_hedge("skipped")
+            with race.cond:
+                race.hedge_state = None
+                race.cond.notify_all()
+
+    def _run_hedge(
+        self,
+        race: _HedgeRace,
+        source_path: str,
+        study_uid: str | None,
+        primary: WorkerState,
+        workers: Optional[FrozenSet[str]],
+    ) -> None:
+        state = "failed"
+        worker = None
         try:
-            assoc = ae.associate(host, port, ae_title=called_aet)
-        except TimeoutError as exc:
-            raise ForwardError("worker_timeout") from exc
+            worker = self._scheduler.acquire(0, affinity_key=study_uid, exclude=primary, only=workers)
+            self._count_hedge("launched")
+            self._send_to(worker, source_path)
+            state = "sent"
         except Exception as exc:  # noqa: BLE001
-            message = str(exc)
-            if "timed out" in message.lower():
-                raise ForwardError("worker_timeout") from exc
-            raise ForwardError(f"worker_association_error:{message}") from exc
-
-        if not assoc.is_established:
-            raise ForwardError("worker_association_refused")
-
+            if worker is None:
+                self._count_hedge("skipped")
+            log_event(
+                "warning",
+                "forward_worker",
+                study_uid=study_uid,
+                sop_uid=None,
+                ae_title=self.config["edge"]["ae_title"],
+                remote_ip=None,
+                outcome="hedge_failed",
+                error=str(exc),
+            )
+        with race.cond:
+            if state == "sent" and not race.primary_done:
+                self._count_hedge("hedge_acked_first")
+            race.hedge_state = state
+            race.hedge_worker = worker
+            race.cond.notify_all()
+
+    def _finish_race(self, race: _HedgeRace, primary_ok: bool) -> WorkerState | None:
+        with race.cond:
+            race.primary_done = True
+            if primary_ok:
+                return None
+            race.cond.wait_for(lambda: race.hedge_state != "pending", self.worker_timeout_seconds)
+            return race.hedge_worker if race.hedge_state == "sent" else None
+
+    def _count_hedge(self, key: str) -> None:
+        with self._hedge_lock:
+            self._hedge_stats[key] += 1
+
+    def _pool_for(self, target: dict, default_host: str, default_port: int, default_aet: str, timeout_s: float) -> AssociationPool:
+        host = str(target.get("host", default_host))
+        port = int(target.get("port", default_port))
+        called_aet = str(target.get("ae_title", default_aet))
+        key = (host, port, called_aet)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = AssociationPool(
+                    ae_title=self.config["edge"]["ae_title"],
+                    host=host,
+                    port=port,
+                    called_aet=called_aet,
+                    timeout_s=timeout_s,
+                    size=int(target.get("pool_size", self.pool_config.get("size", 2))),
+                    max_associations=int(target.get("max_associations", self.pool_config.get("max_associations", 4))),
+                    idle_timeout_s=float(self.pool_config.get("idle_timeout_seconds", 30)),
+                    echo_after_idle_s=float(self.pool_config.get("echo_after_idle_seconds", 5)),
+                )
+                self._pools[key] = pool
+                self._breakers[key] = CircuitBreaker(
+                    name=f"{called_aet}@{host}:{port}",
+                    probe=pool.echo,
+                    probes=self._breaker_probes,
+                    failure_threshold=int(self.breaker_config.get("failure_threshold", 5)),
+                    open_seconds=float(self.breaker_config.get("open_seconds", 5)),
+                    max_open_seconds=float(self.breaker_config.get("max_open_seconds", 60)),
+                )
+                self._rate_limits[key] = TokenBucket(
+                    float(target.get("rate_per_second", self.rate_limit_config.get("rate_per_second", 0))),
+                    float(target.get("burst", self.rate_limit_config.get("burst", 50))),
+                )
+            return pool
+
+    def _breaker_for(self, pool: AssociationPool) -> CircuitBreaker:
+        with self._pools_lock:
+            return self._breakers[(pool.host, pool.port, pool.called_aet)]
+
+    def _worker_available(self, worker) -> bool:
+        pool = self._pool_for(worker.target, worker.host, worker.port, worker.ae_title, worker.timeout_s)
+        return self._breaker_for(pool).available()
+
+    def _send(self, pool: AssociationPool, source_path: str, error_prefix: str, timeout_s: float | None = None) -> None:
+        error = self._send_many(pool, [source_path], error_prefix, timeout_s)[0]
+        if error is not None:
+            raise ForwardError(error)
+
+    def _send_many(
+        self,
+        pool: AssociationPool,
+        source_paths: List[str],
+        error_prefix: str,
+        timeout_s: float | None = None,
+    ) -> List[str | None]:
+        breaker = self._breaker_for(pool)
+        if not breaker.allow():
+            return [f"{error_prefix}circuit_open"] * len(source_paths)
+        with self._pools_lock:
+            limiter = self._rate_limits[(pool.host, pool.port, pool.called_aet)]
+        errors: List[str | None] = []
+        attempted = False
+        try:
+            with pool.association() as assoc:
+                for source_path in source_paths:
+                    if not limiter.acquire(timeout=pool.timeout_s):
+                        errors.append(f"{error_prefix}rate_limited")
+                        continue
+                    attempted = True
+                    try:
+                        self._store_one(assoc, pool, breaker, source_path, error_prefix, timeout_s)
+                        errors.append(None)
+                    except ForwardError as exc:
+                        errors.append(str(exc))
+                        if not assoc.is_established:
+                            break
+        except AssociationError as exc:
+            # pool_timeout/pool_closed are local conditions, not destination health.
+            if str(exc) not in {"pool_timeout", "pool_closed"}:
+                attempted = True
+                breaker.record_failure()
+            errors.append(f"{error_prefix}{exc}")
+        if not attempted:
+            breaker.release_trial()
+        # Instances left unsent after the association was lost fail with the same error.
+        errors.extend([errors[-1]] * (len(source_paths) - len(errors)))
+        return errors
+
+    @staticmethod
+    def _store_one(
+        assoc,
+        pool: AssociationPool,
+        breaker: CircuitBreaker,
+        source_path: str,
+        error_prefix: str,
+        timeout_s: float | None,
+    ) -> None:
         try:
-            ds = pydicom.dcmread(source_path)
-            status = assoc.send_c_store(ds)
+            if timeout_s is not None:
+                assoc.dimse_timeout = timeout_s
+            try:
+                status = assoc.send_c_store(source_path)
+            finally:
+                if timeout_s is not None:
+                    assoc.dimse_timeout = pool.timeout_s
+            # pynetdicom aborts and returns an empty status when the DIMSE timeout expires.
+            if getattr(status, "Status", None) is None and not assoc.is_established:
+                raise TimeoutError("dimse_timeout")
         except TimeoutError as exc:
-            raise ForwardError("worker_timeout") from exc
+            breaker.record_failure()
+            raise ForwardError(f"{error_prefix}timeout") from exc
         except Exception as exc:  # noqa: BLE001
-            raise ForwardError(f"worker_c_store_error:{exc}") from exc
-        finally:
-            assoc.release()
+            breaker.record_failure()
+            raise ForwardError(f"{error_prefix}c_store_error:{exc}") from exc
 
         if status is None:
-            raise ForwardError("worker_c_store_no_status")
+            breaker.record_failure()
+            raise ForwardError(f"{error_prefix}c_store_no_status")
+        # Any DIMSE status means the destination is up, even if it refused the instance.
+        breaker.record_success()
         status_code = getattr(status, "Status", None)
         if status_code != 0x0000:
-            raise ForwardError(f"worker_c_store_failure:{status_code}")
-
-        return {
-            "host": host,
-            "port": port,
-            "ae_title": called_aet,
-        }
-
-    def _determine_route(self, source_path: str) -> str:
-        ds = pydicom.dcmread(source_path, stop_before_pixels=True)
-        series_description = str(getattr(ds, "SeriesDescription", "")).strip()
-        modality = str(getattr(ds, "Modality", "")).strip()
-        sop_class = str(getattr(ds, "SOPClassUID", "")).strip()
-
-        if series_description == "AI_RESULT" or modality in {"SR", "OT"} or sop_class == str(SecondaryCaptureImageStorage):
-            return "orthanc"
-        return "worker"
+            raise ForwardError(f"{error_prefix}c_store_failure:{status_code}")
+
+    def worker_stats(self) -> Dict[str, Any]:
+        if self._scheduler is None:
+            return {}
+        result = self._scheduler.stats()
+        if self.hedging_enabled:
+            with self._hedge_lock:
+                result["hedging"] = dict(self._hedge_stats)
+        return result
+
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        with self._pools_lock:
+            limits = dict(self._rate_limits)
+        return {f"{aet}@{host}:{port}": limiter.stats() for (host, port, aet), limiter in limits.items()}
+
+    def breaker_stats(self) -> List[Dict[str, Any]]:
+        with self._pools_lock:
+            breakers = list(self._breakers.values())
+        return [breaker.stats() for breaker in breakers]
+
+    def pool_stats(self) -> List[Dict[str, Any]]:
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        return [pool.stats() for pool in pools]
+
+    def close(self) -> None:
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+            self._breakers = {}
+            self._rate_limits = {}
+        for pool in pools:
+            pool.close()
+
+    def _determine_route(self, item) -> Route:
+        # The header was indexed at receive time; only rows enqueued before the
+        # index existed fall back to reading the file.
+        header = get_header(item.id)
+        if header is None:
+            header = read_header(item.file_path)
+        return get_routing_table().route(header)
 
     def _handle_failure(self, item, error: str) -> None:
+        self._failed_meter.mark()
         self._log_forward(item.study_uid, item.sop_uid, result="failed", error=error)
-        increment_retry(item.id, error)
+        if error.endswith("circuit_open"):
+            # Rejected locally without reaching the destination: wait out the
+            # breaker instead of spending one of the item's retries.
+            delay = float(self.breaker_config.get("open_seconds", 5)) * random.uniform(
+                1.0 - self.retry_jitter, 1.0 + self.retry_jitter
+            )
+            defer_forward_retry(item.id, error, delay, count_attempt=False)
+            self._retries.schedule(delay, item.id)
+            log_event(
+                "warning",
+                "forward",
+                study_uid=item.study_uid,
+                sop_uid=item.sop_uid,
+                ae_title=self.config["edge"]["ae_title"],
+                remote_ip=None,
+                outcome="deferred",
+                retry_in_seconds=round(delay, 3),
+                error=error,
+            )
+            return
         new_retries = item.retries + 1
         if new_retries >= self.max_retries:
             try:
                 failed_path = self._move_to_failed(item.file_path, item.study_uid, item.sop_uid)
-                update_state(item.id, STATE_FAILED, file_path=failed_path, last_error=error)
+                fields = {"file_path": failed_path, "last_error": error}
             except Exception as exc:  # noqa: BLE001
-                update_state(item.id, STATE_FAILED, last_error=f"{error};move_failed:{exc}")
+                fields = {"last_error": f"{error};move_failed:{exc}"}
+            record_forward_failure(item.id, error, STATE_FAILED, **fields)
             return
 
-        update_state(item.id, STATE_QUEUED, last_error=error)
+        # The item stays claimed (STATE_FORWARDING) until its retry is due, so it
+        # never sits at the head of the queue blocking items behind it. The due
+        # time is persisted, so claim_queued requeues it even after a restart.
         backoff = self.backoff_base * (2 ** (new_retries - 1))
+        delay = backoff * random.uniform(1.0 - self.retry_jitter, 1.0 + self.retry_jitter)
+        defer_forward_retry(item.id, error, delay)
+        self._retries.schedule(delay, item.id)
         log_event(
             "warning",
             "forward",
@@ -229,9 +596,9 @@ class Forwarder:
             ae_title=self.config["edge"]["ae_title"],
             remote_ip=None,
             outcome="retry",
+            retry_in_seconds=round(delay, 3),
             error=error,
         )
-        time.sleep(backoff)
 
     def _log_forward(self, study_uid: str, sop_uid: str, result: str, error: str | None, destination: str | None = None) -> None:
         level = "info" if result == "sent" else "error"
@@ -0,0 +1,32 @@
+import bisect
+import hashlib
+from typing import Dict, Iterator, List, Tuple
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    def __init__(self, weights: Dict[str, float], vnodes: int = 100) -> None:
+        points: List[Tuple[int, str]] = []
+        for node, weight in weights.items():
+            for idx in range(max(1, int(round(vnodes * weight)))):
+                points.append((_hash(f"{node}#{idx}"), node))
+        points.sort()
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+        self._distinct = len(weights)
+
+    def walk(self, key: str) -> Iterator[str]:
+        if not self._nodes:
+            return
+        start = bisect.bisect(self._hashes, _hash(key))
+        seen = set()
+        for offset in range(len(self._nodes)):
+            node = self._nodes[(start + offset) % len(self._nodes)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == self._distinct:
+                    return
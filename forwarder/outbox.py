@@ -0,0 +1,58 @@
+import random
+import threading
+from typing import Any, Callable, Dict
+
+from forwarder.ratelimit import TokenBucket
+from forwarder.retry import RetryScheduler
+
+
+class RetryOutbox:
+    def __init__(
+        self,
+        name: str,
+        redrive: Callable[..., None],
+        max_retries: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+        jitter: float,
+        drain_rate_per_second: float,
+        drain_burst: float,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base_seconds
+        self.backoff_max = backoff_max_seconds
+        self.jitter = min(1.0, max(0.0, jitter))
+        self._redrive = redrive
+        self._bucket = TokenBucket(drain_rate_per_second, drain_burst)
+        self._scheduler = RetryScheduler(name, self._due)
+        self._lock = threading.Lock()
+        self._stats = {"scheduled": 0, "redriven": 0, "exhausted": 0}
+
+    def schedule(self, attempt: int, args: tuple) -> bool:
+        if attempt > self.max_retries:
+            with self._lock:
+                self._stats["exhausted"] += 1
+            return False
+        backoff = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        delay = backoff * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        self._scheduler.schedule(delay, (attempt, args))
+        with self._lock:
+            self._stats["scheduled"] += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        stats["max_retries"] = self.max_retries
+        stats["pending"] = self._scheduler.stats()["pending"]
+        stats["drain"] = self._bucket.stats()
+        return stats
+
+    def _due(self, payload: Any) -> None:
+        attempt, args = payload
+        # Due retries are released one at a time at the drain rate so a PACS
+        # that just came back is not hit by the whole backlog at once.
+        self._bucket.acquire()
+        self._redrive(*args, attempt=attempt)
+        with self._lock:
+            self._stats["redriven"] += 1
@@ -0,0 +1,196 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pynetdicom import AE
+from pynetdicom.association import Association
+from pynetdicom.sop_class import CTImageStorage, MRImageStorage, SecondaryCaptureImageStorage, Verification
+
+
+class AssociationError(RuntimeError):
+    pass
+
+
+class AssociationPool:
+    def __init__(
+        self,
+        ae_title: str,
+        host: str,
+        port: int,
+        called_aet: str,
+        timeout_s: float,
+        size: int,
+        max_associations: int,
+        idle_timeout_s: float,
+        echo_after_idle_s: float,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.called_aet = called_aet
+        self.timeout_s = timeout_s
+        self.size = max(0, size)
+        self.max_associations = max(1, max_associations)
+        self.idle_timeout_s = idle_timeout_s
+        self.echo_after_idle_s = echo_after_idle_s
+
+        self._ae = AE(ae_title=ae_title)
+        self._ae.add_requested_context(CTImageStorage)
+        self._ae.add_requested_context(MRImageStorage)
+        self._ae.add_requested_context(SecondaryCaptureImageStorage)
+        self._ae.add_requested_context(Verification)
+        self._ae.acse_timeout = timeout_s
+        self._ae.dimse_timeout = timeout_s
+        self._ae.network_timeout = idle_timeout_s + timeout_s
+
+        self._cond = threading.Condition()
+        self._idle: List[Tuple[Association, float]] = []
+        self._open = 0
+        self._closed = False
+        self._stats = {"created": 0, "reused": 0, "discarded": 0, "echo_failed": 0}
+
+        self._reaper = threading.Thread(target=self._reap_idle, daemon=True)
+        self._reaper.start()
+
+    @contextmanager
+    def association(self) -> Iterator[Association]:
+        assoc = self._checkout()
+        try:
+            yield assoc
+        finally:
+            self._checkin(assoc)
+
+    def echo(self) -> bool:
+        try:
+            with self.association() as assoc:
+                return self._echo(assoc)
+        except AssociationError:
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "destination": f"{self.called_aet}@{self.host}:{self.port}",
+                "open": self._open,
+                "idle": idle,
+                "in_use": self._open - idle,
+                "max_associations": self.max_associations,
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = [assoc for assoc, _ in self._idle]
+            self._idle = []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for assoc in idle:
+            self._close(assoc)
+
+    def _checkout(self) -> Association:
+        deadline = time.monotonic() + self.timeout_s
+        while True:
+            assoc, idle_for = self._take(deadline)
+            if assoc is None:
+                return self._connect()
+            if idle_for < self.echo_after_idle_s or self._echo(assoc):
+                with self._cond:
+                    self._stats["reused"] += 1
+                return assoc
+            with self._cond:
+                self._stats["echo_failed"] += 1
+            self._discard(assoc)
+
+    def _take(self, deadline: float) -> Tuple[Optional[Association], float]:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise AssociationError("pool_closed")
+                while self._idle:
+                    assoc, last_used = self._idle.pop()
+                    if assoc.is_established:
+                        return assoc, time.monotonic() - last_used
+                    self._open -= 1
+                    self._stats["discarded"] += 1
+                if self._open < self.max_associations:
+                    self._open += 1
+                    return None, 0.0
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise AssociationError("pool_timeout")
+                self._cond.wait(remaining)
+
+    def _connect(self) -> Association:
+        try:
+            assoc = self._ae.associate(self.host, self.port, ae_title=self.called_aet)
+        except TimeoutError as exc:
+            self._release_slot()
+            raise AssociationError("timeout") from exc
+        except Exception as exc:  # noqa: BLE001
+            self._release_slot()
+            message = str(exc)
+            if "timed out" in message.lower():
+                raise AssociationError("timeout") from exc
+            raise AssociationError(f"association_error:{message}") from exc
+
+        if not assoc.is_established:
+            self._release_slot()
+            raise AssociationError("association_refused")
+        with self._cond:
+            self._stats["created"] += 1
+        return assoc
+
+    def _checkin(self, assoc: Association) -> None:
+        with self._cond:
+            keep = assoc.is_established and not self._closed and len(self._idle) < self.size
+            if keep:
+                self._idle.append((assoc, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(assoc)
+
+    def _discard(self, assoc: Association) -> None:
+        self._release_slot()
+        with self._cond:
+            self._stats["discarded"] += 1
+        self._close(assoc)
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _reap_idle(self) -> None:
+        interval = max(1.0, min(self.idle_timeout_s / 2, 5.0))
+        while not self._closed:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._cond:
+                expired = [assoc for assoc, last_used in self._idle if now - last_used >= self.idle_timeout_s]
+                self._idle = [(assoc, last_used) for assoc, last_used in self._idle if now - last_used < self.idle_timeout_s]
+                self._open -= len(expired)
+                self._stats["discarded"] += len(expired)
+                if expired:
+                    self._cond.notify_all()
+            for assoc in expired:
+                self._close(assoc)
+
+    @staticmethod
+    def _echo(assoc: Association) -> bool:
+        try:
+            status = assoc.send_c_echo()
+        except Exception:  # noqa: BLE001
+            return False
+        return bool(status) and getattr(status, "Status", None) == 0x0000 and assoc.is_established
+
+    @staticmethod
+    def _close(assoc: Association) -> None:
+        try:
+            if assoc.is_established:
+                assoc.release()
+            else:
+                assoc.abort()
+        except Exception:  # noqa: BLE001
+            pass
@@ -0,0 +1,44 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# C-STORE request Priority (0000,0700) values.
+DICOM_PRIORITIES = {0: "MEDIUM", 1: "HIGH", 2: "LOW"}
+
+
+class PriorityRules:
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.lanes: List[str] = [str(lane) for lane in config.get("lanes", ["routine"])] or ["routine"]
+        self.default_lane = str(config.get("default_lane", self.lanes[-1]))
+        if self.default_lane not in self.lanes:
+            raise ValueError(f"Unknown default priority lane: {self.default_lane}")
+        self.starvation_seconds = float(config.get("starvation_seconds", 10))
+        self._rules = [self._compile(rule) for rule in config.get("rules", [])]
+
+    def classify(self, header: Dict[str, Any], request_priority: Optional[int]) -> str:
+        for lane, checks in self._rules:
+            if all(check(header, request_priority) for check in checks):
+                return lane
+        return self.default_lane
+
+    def _compile(self, rule: Dict[str, Any]) -> Tuple[str, List[Callable[[Dict[str, Any], Optional[int]], bool]]]:
+        lane = str(rule.get("lane"))
+        if lane not in self.lanes:
+            raise ValueError(f"Priority rule targets unknown lane: {lane}")
+        checks: List[Callable[[Dict[str, Any], Optional[int]], bool]] = []
+        if "modality" in rule:
+            modalities = {str(value).upper() for value in _as_list(rule["modality"])}
+            checks.append(lambda header, _: (header.get("Modality") or "").upper() in modalities)
+        if "study_description_regex" in rule:
+            pattern = re.compile(str(rule["study_description_regex"]))
+            checks.append(lambda header, _: bool(pattern.search(header.get("StudyDescription") or "")))
+        if "dicom_priority" in rule:
+            priorities = {str(value).upper() for value in _as_list(rule["dicom_priority"])}
+            checks.append(lambda _, priority: DICOM_PRIORITIES.get(priority) in priorities)
+        if not checks:
+            raise ValueError(f"Priority rule for lane {lane} has no conditions")
+        return lane, checks
+
+
+def _as_list(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
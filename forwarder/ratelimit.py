@@ -0,0 +1,57 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, burst: float) -> None:
+        self.rate = max(0.0, rate_per_second)
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {"granted": 0, "throttled": 0, "wait_seconds_total": 0.0}
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self._stats["granted"] += 1
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        if self.rate <= 0:
+            return True
+        started = time.monotonic()
+        throttled = False
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self._stats["granted"] += 1
+                    if throttled:
+                        self._stats["wait_seconds_total"] += time.monotonic() - started
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+                if not throttled:
+                    throttled = True
+                    self._stats["throttled"] += 1
+            if timeout is not None:
+                remaining = started + timeout - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill()
+            return {"rate_per_second": self.rate, "burst": self.burst, "tokens": round(self._tokens, 2), **self._stats}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
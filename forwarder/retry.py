@@ -0,0 +1,56 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from receiver.config import log_event
+
+
+class RetryScheduler:
+    def __init__(self, name: str, on_due: Callable[[Any], None]) -> None:
+        self.name = name
+        self._on_due = on_due
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stats = {"scheduled": 0, "fired": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def schedule(self, delay_seconds: float, payload: Any) -> None:
+        due = time.monotonic() + max(0.0, delay_seconds)
+        with self._cond:
+            heapq.heappush(self._heap, (due, next(self._seq), payload))
+            self._stats["scheduled"] += 1
+            self._cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            next_due = round(self._heap[0][0] - time.monotonic(), 3) if self._heap else None
+            return {"pending": len(self._heap), "next_due_in_seconds": next_due, **self._stats}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                _, _, payload = heapq.heappop(self._heap)
+            try:
+                self._on_due(payload)
+                outcome = "fired"
+            except Exception as exc:  # noqa: BLE001
+                outcome = "errors"
+                log_event(
+                    "error",
+                    self.name,
+                    study_uid=None,
+                    sop_uid=None,
+                    ae_title=None,
+                    remote_ip=None,
+                    outcome="retry_dispatch_failed",
+                    error=str(exc),
+                )
+            with self._cond:
+                self._stats[outcome] += 1
@@ -0,0 +1,240 @@
+import re
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from receiver.config import get_current_config, log_event
+
+
+DESTINATIONS = {"orthanc", "workers", "ai_result"}
+
+# Rules can only match on attributes captured at receive time (and indexed), so
+# routing never has to reopen the file.
+KEYWORDS = {
+    "SOPClassUID",
+    "StudyInstanceUID",
+    "SeriesInstanceUID",
+    "SOPInstanceUID",
+    "Modality",
+    "SeriesDescription",
+    "StudyDescription",
+    "PatientID",
+    "TransferSyntaxUID",
+    "ReferencedSOPInstanceUID",
+    "FileSize",
+}
+
+# Used when config.yaml has no forwarder.routing.rules; matches the previous
+# hard-coded gateway routing.
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {"name": "ai_result", "match": {"SeriesDescription": {"equals": "AI_RESULT"}}, "destination": "ai_result"},
+    {"name": "derived", "match": {"Modality": {"in": ["SR", "OT"]}}, "destination": "orthanc"},
+    {
+        "name": "secondary_capture",
+        "match": {"SOPClassUID": {"equals": "1.2.840.10008.5.1.4.1.1.7"}},
+        "destination": "orthanc",
+    },
+]
+
+# Parallel mode used to send every instance except AI results to a worker.
+PARALLEL_DEFAULT_RULES: List[Dict[str, Any]] = DEFAULT_RULES[:1]
+
+_Check = Callable[[Dict[str, Any]], bool]
+
+
+class Route:
+    def __init__(self, name: str, destination: str, workers: Optional[FrozenSet[str]] = None) -> None:
+        self.name = name
+        self.destination = destination
+        self.workers = workers
+
+
+class RoutingTable:
+    def __init__(self, config: Dict[str, Any], worker_titles: Iterable[str] = (), mode: str = "gateway") -> None:
+        self._worker_titles = {str(title) for title in worker_titles}
+        self.default = self._route("default", config.get("default", "workers"), config.get("default_workers"))
+        rules = config.get("rules")
+        if rules is None:
+            rules = PARALLEL_DEFAULT_RULES if mode == "parallel" else DEFAULT_RULES
+        self.routes: List[Route] = []
+        matches: List[Dict[str, Dict[str, Any]]] = []
+        for idx, rule in enumerate(rules):
+            name = str(rule.get("name", f"rule_{idx}"))
+            match = rule.get("match") or {}
+            if not match:
+                raise ValueError(f"Routing rule {name} has no match conditions")
+            for keyword in match:
+                if keyword not in KEYWORDS:
+                    raise ValueError(f"Routing rule {name} matches on unsupported keyword: {keyword}")
+            self.routes.append(self._route(name, rule.get("destination"), rule.get("workers")))
+            matches.append(match)
+        self._compile(matches)
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+
+    def route(self, header: Dict[str, Any]) -> Route:
+        candidates = self._wildcard
+        if self._dispatch_keyword is not None:
+            candidates = self._by_value.get(_text(header.get(self._dispatch_keyword)), self._wildcard)
+        route = self.default
+        for idx in candidates:
+            if all(check(header) for check in self._checks[idx]):
+                route = self.routes[idx]
+                break
+        with self._lock:
+            self._hits[route.name] = self._hits.get(route.name, 0) + 1
+        return route
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = dict(self._hits)
+        return {
+            "rules": len(self.routes),
+            "dispatch_keyword": self._dispatch_keyword,
+            "hits": hits,
+        }
+
+    def _route(self, name: str, destination: Any, workers: Any) -> Route:
+        destination = str(destination).lower()
+        if destination not in DESTINATIONS:
+            raise ValueError(f"Routing rule {name} targets unknown destination: {destination}")
+        if not workers:
+            return Route(name, destination)
+        if destination != "workers":
+            raise ValueError(f"Routing rule {name} lists workers but routes to {destination}")
+        titles = frozenset(str(title) for title in _as_list(workers))
+        unknown = titles - self._worker_titles
+        if unknown:
+            raise ValueError(f"Routing rule {name} targets unknown workers: {sorted(unknown)}")
+        return Route(name, destination, titles)
+
+    def _compile(self, matches: List[Dict[str, Dict[str, Any]]]) -> None:
+        # Rules are indexed by the keyword most of them test for equality (usually
+        # Modality), so an instance is only checked against the rules that can match
+        # its value plus the rules that do not constrain that keyword at all.
+        sets: List[Dict[str, FrozenSet[str]]] = []
+        for match in matches:
+            keyword_sets = {keyword: _value_set(predicate) for keyword, predicate in match.items()}
+            sets.append({keyword: values for keyword, values in keyword_sets.items() if values is not None})
+        counts: Dict[str, int] = {}
+        for keyword_sets in sets:
+            for keyword in keyword_sets:
+                counts[keyword] = counts.get(keyword, 0) + 1
+        self._dispatch_keyword = max(counts, key=lambda keyword: counts[keyword]) if counts else None
+        self._checks: List[List[_Check]] = []
+        wildcard: List[int] = []
+        indexed: Dict[str, List[int]] = {}
+        for idx, match in enumerate(matches):
+            values = sets[idx].get(self._dispatch_keyword) if self._dispatch_keyword is not None else None
+            checks = [
+                _predicate(keyword, predicate)
+                for keyword, predicate in match.items()
+                if values is None or keyword != self._dispatch_keyword
+            ]
+            self._checks.append(checks)
+            if values is None:
+                wildcard.append(idx)
+            else:
+                for value in values:
+                    indexed.setdefault(value, []).append(idx)
+        # First matching rule wins, so each bucket keeps the rules in config order.
+        self._wildcard: Tuple[int, ...] = tuple(wildcard)
+        self._by_value: Dict[str, Tuple[int, ...]] = {
+            value: tuple(sorted(set(indices) | set(wildcard))) for value, indices in indexed.items()
+        }
+
+
+def _predicate(keyword: str, predicate: Dict[str, Any]) -> _Check:
+    if not isinstance(predicate, dict) or len(predicate) != 1:
+        raise ValueError(f"Routing predicate for {keyword} must have exactly one of equals/in/regex/range")
+    (kind, operand), = predicate.items()
+    if kind in {"equals", "in"}:
+        values = _value_set(predicate)
+        return lambda header: _text(header.get(keyword)) in values
+    if kind == "regex":
+        pattern = re.compile(str(operand))
+        return lambda header: bool(pattern.search(_text(header.get(keyword))))
+    if kind == "range":
+        bounds = _as_list(operand)
+        if len(bounds) != 2:
+            raise ValueError(f"Routing range for {keyword} must be [min, max]")
+        low = float(bounds[0]) if bounds[0] is not None else float("-inf")
+        high = float(bounds[1]) if bounds[1] is not None else float("inf")
+        return lambda header: low <= _number(header.get(keyword)) <= high
+    raise ValueError(f"Unsupported routing predicate for {keyword}: {kind}")
+
+
+def _value_set(predicate: Any) -> Optional[FrozenSet[str]]:
+    if not isinstance(predicate, dict) or len(predicate) != 1:
+        return None
+    if "equals" in predicate:
+        return frozenset([_text(predicate["equals"])])
+    if "in" in predicate:
+        return frozenset(_text(value) for value in _as_list(predicate["in"]))
+    return None
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _as_list(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+_TABLE: Optional[RoutingTable] = None
+_TABLE_SOURCE: Optional[Dict[str, Any]] = None
+_TABLE_LOCK = threading.Lock()
+
+
+def get_routing_table() -> RoutingTable:
+    global _TABLE, _TABLE_SOURCE
+    config = get_current_config()
+    table = _TABLE
+    if table is not None and _TABLE_SOURCE is config:
+        return table
+    with _TABLE_LOCK:
+        if _TABLE is not None and _TABLE_SOURCE is config:
+            return _TABLE
+        forwarder_config = config.get("forwarder", {})
+        titles = [worker.get("ae_title", "WORKER") for worker in forwarder_config.get("workers", [])]
+        try:
+            fresh = RoutingTable(
+                forwarder_config.get("routing", {}), titles, str(forwarder_config.get("mode", "dummy")).lower()
+            )
+        except (ValueError, re.error) as exc:
+            if _TABLE is None:
+                raise
+            # Keep routing with the last good rules until config.yaml is fixed.
+            _TABLE_SOURCE = config
+            log_event(
+                "error",
+                "routing",
+                study_uid=None,
+                sop_uid=None,
+                ae_title=None,
+                remote_ip=None,
+                outcome="reload_rejected",
+                error=str(exc),
+            )
+            return _TABLE
+        reloaded = _TABLE is not None
+        _TABLE, _TABLE_SOURCE = fresh, config
+    if reloaded:
+        log_event(
+            "info",
+            "routing",
+            study_uid=None,
+            sop_uid=None,
+            ae_title=None,
+            remote_ip=None,
+            outcome="reloaded",
+            rules=len(fresh.routes),
+        )
+    return fresh
@@ -0,0 +1,206 @@
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Collection, Deque, Dict, List, Optional
+
+from forwarder.hashring import HashRing
+
+
+class SchedulerError(RuntimeError):
+    pass
+
+
+class WorkerState:
+    def __init__(self, target: Dict[str, Any], default_timeout_s: float, initial_latency_ms: float, window: int) -> None:
+        self.target = target
+        self.host = str(target.get("host"))
+        self.port = int(target.get("port", 11112))
+        self.ae_title = str(target.get("ae_title", "WORKER"))
+        self.timeout_s = float(target.get("timeout_s", default_timeout_s))
+        self.weight = max(0.01, float(target.get("weight", 1.0)))
+        max_concurrency = target.get("max_concurrency")
+        self.max_concurrency = int(max_concurrency) if max_concurrency else None
+        self.in_flight = 0
+        self.ewma_ms = initial_latency_ms
+        self.samples: Deque[float] = deque(maxlen=max(1, window))
+        self.sent = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.consecutive_timeouts = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.ae_title}@{self.host}:{self.port}"
+
+    def has_capacity(self) -> bool:
+        return self.max_concurrency is None or self.in_flight < self.max_concurrency
+
+    def score(self) -> float:
+        return (self.in_flight + 1) * self.ewma_ms / self.weight
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class WorkerScheduler:
+    def __init__(
+        self,
+        workers: List[Dict[str, Any]],
+        default_timeout_s: float,
+        policy: str = "p2c",
+        ewma_alpha: float = 0.2,
+        initial_latency_ms: float = 100.0,
+        is_available: Optional[Callable[[WorkerState], bool]] = None,
+        affinity_load_factor: float = 1.25,
+        adaptive_timeout: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if policy not in {"p2c", "least_outstanding", "study_affinity"}:
+            raise ValueError(f"Unsupported worker selection policy: {policy}")
+        self.policy = policy
+        self.ewma_alpha = min(1.0, max(0.01, ewma_alpha))
+        adaptive = adaptive_timeout or {}
+        self.adaptive_enabled = bool(adaptive.get("enabled", False))
+        self.adaptive_percentile = float(adaptive.get("percentile", 0.99))
+        self.adaptive_multiplier = float(adaptive.get("multiplier", 2.0))
+        self.adaptive_min_s = float(adaptive.get("min_seconds", 1.0))
+        self.min_samples = max(1, int(adaptive.get("min_samples", 20)))
+        window = int(adaptive.get("window", 200))
+        self.workers = [WorkerState(worker, default_timeout_s, initial_latency_ms, window) for worker in workers]
+        self.affinity_load_factor = max(1.0, affinity_load_factor)
+        self._by_key = {worker.key: worker for worker in self.workers}
+        self._ring = HashRing({worker.key: worker.weight for worker in self.workers})
+        self._affinity = {"home": 0, "spilled": 0}
+        self._is_available = is_available or (lambda worker: True)
+        self._cond = threading.Condition()
+
+    def acquire(
+        self,
+        timeout_s: float,
+        affinity_key: Optional[str] = None,
+        exclude: Optional[WorkerState] = None,
+        only: Optional[Collection[str]] = None,
+    ) -> WorkerState:
+        deadline = time.monotonic() + timeout_s
+        with self._cond:
+            while True:
+                healthy = [
+                    worker
+                    for worker in self.workers
+                    if worker is not exclude and (only is None or worker.ae_title in only) and self._is_available(worker)
+                ]
+                if not healthy:
+                    raise SchedulerError("workers_unavailable")
+                candidates = [worker for worker in healthy if worker.has_capacity()]
+                if candidates:
+                    if self.policy == "study_affinity" and affinity_key:
+                        worker = self._choose_affine(affinity_key, healthy, candidates)
+                    else:
+                        worker = self._choose(candidates)
+                    worker.in_flight += 1
+                    return worker
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SchedulerError("workers_saturated")
+                # Breakers can close without a release, so re-check periodically.
+                self._cond.wait(min(remaining, 1.0))
+
+    def release(
+        self,
+        worker: WorkerState,
+        latency_s: float,
+        ok: bool,
+        timed_out_after: Optional[float] = None,
+    ) -> None:
+        # A failed send is charged at least the worker's full timeout so that a
+        # dead worker quickly stops looking attractive.
+        sample_ms = latency_s * 1000.0 if ok else max(latency_s, worker.timeout_s) * 1000.0
+        with self._cond:
+            worker.in_flight -= 1
+            worker.ewma_ms += self.ewma_alpha * (sample_ms - worker.ewma_ms)
+            if ok:
+                worker.samples.append(latency_s)
+                worker.sent += 1
+                worker.consecutive_timeouts = 0
+            else:
+                worker.failed += 1
+                if timed_out_after is not None:
+                    # The real latency was at least the timeout. Sampling it (and backing
+                    # off below) lets the adaptive timeout grow again when a worker slows
+                    # down, instead of staying pinned to its old tail latency.
+                    worker.samples.append(timed_out_after)
+                    worker.timeouts += 1
+                    worker.consecutive_timeouts += 1
+            self._cond.notify()
+
+    def timeout_for(self, worker: WorkerState) -> float:
+        # The configured timeout_s stays the ceiling; once enough latency has been
+        # observed the worker is given a multiple of its own tail latency instead,
+        # doubled for every consecutive timeout.
+        with self._cond:
+            if not self.adaptive_enabled or len(worker.samples) < self.min_samples:
+                return worker.timeout_s
+            adaptive = worker.percentile(self.adaptive_percentile) * self.adaptive_multiplier
+            adaptive *= 2 ** min(worker.consecutive_timeouts, 10)
+        return min(worker.timeout_s, max(self.adaptive_min_s, adaptive))
+
+    def latency_percentile(self, worker: WorkerState, fraction: float) -> Optional[float]:
+        with self._cond:
+            if len(worker.samples) < self.min_samples:
+                return None
+            return worker.percentile(fraction)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            workers = [
+                {
+                    "worker": worker.key,
+                    "weight": worker.weight,
+                    "max_concurrency": worker.max_concurrency,
+                    "in_flight": worker.in_flight,
+                    "ewma_ms": round(worker.ewma_ms, 1),
+                    "p95_ms": round(worker.percentile(0.95) * 1000.0, 1) if worker.samples else None,
+                    "p99_ms": round(worker.percentile(0.99) * 1000.0, 1) if worker.samples else None,
+                    "sent": worker.sent,
+                    "failed": worker.failed,
+                    "timeouts": worker.timeouts,
+                }
+                for worker in self.workers
+            ]
+            result: Dict[str, Any] = {"policy": self.policy, "workers": workers}
+            if self.policy == "study_affinity":
+                result["affinity"] = dict(self._affinity)
+            return result
+
+    def _choose(self, candidates: List[WorkerState]) -> WorkerState:
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.policy == "least_outstanding":
+            return min(candidates, key=lambda worker: ((worker.in_flight + 1) / worker.weight, worker.ewma_ms))
+        first, second = random.choices(candidates, weights=[worker.weight for worker in candidates], k=2)
+        if first is second:
+            second = random.choice([worker for worker in candidates if worker is not first])
+        return first if first.score() <= second.score() else second
+
+    def _choose_affine(self, key: str, healthy: List[WorkerState], candidates: List[WorkerState]) -> WorkerState:
+        # Consistent hashing with bounded loads: walk the ring from the study's
+        # position and take the first worker below its share of the current load,
+        # so one large study spills over instead of piling onto a single worker.
+        total_in_flight = sum(worker.in_flight for worker in healthy) + 1
+        total_weight = sum(worker.weight for worker in healthy)
+        eligible = {worker.key for worker in candidates}
+        home = True
+        for node in self._ring.walk(key):
+            worker = self._by_key[node]
+            if worker.key not in eligible:
+                home = home and worker not in healthy
+                continue
+            bound = math.ceil(self.affinity_load_factor * total_in_flight * worker.weight / total_weight)
+            if worker.in_flight < bound:
+                self._affinity["home" if home else "spilled"] += 1
+                return worker
+            home = False
+        self._affinity["spilled"] += 1
+        return self._choose(candidates)
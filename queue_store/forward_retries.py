@@ -0,0 +1,34 @@
+from db import transaction
+
+
+# Forward retries waiting out their backoff. The queue row stays claimed until
+# next_attempt_at, so a pending retry survives a forwarder restart.
+def init_forward_retries() -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS forward_retries (
+                    item_id BIGINT PRIMARY KEY,
+                    next_attempt_at TIMESTAMPTZ NOT NULL
+                )
+                """
+            )
+            cur.execute("CREATE INDEX IF NOT EXISTS forward_retries_due_idx ON forward_retries (next_attempt_at)")
+
+
+def schedule_forward_retry(item_id: int, delay_seconds: float) -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO forward_retries (item_id, next_attempt_at) "
+                "VALUES (%s, now() + %s * interval '1 second') "
+                "ON CONFLICT (item_id) DO UPDATE SET next_attempt_at = EXCLUDED.next_attempt_at",
+                (item_id, delay_seconds),
+            )
+
+
+def clear_forward_retries() -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE forward_retries")
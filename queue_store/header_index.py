@@ -0,0 +1,89 @@
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import RealDictCursor
+
+from db import transaction
+
+
+# Header attributes captured once at receive time; routing, prioritisation and
+# status reporting read them from here instead of reopening the DICOM file.
+COLUMNS = {
+    "series_uid": "SeriesInstanceUID",
+    "sop_class_uid": "SOPClassUID",
+    "modality": "Modality",
+    "series_description": "SeriesDescription",
+    "study_description": "StudyDescription",
+    "patient_id": "PatientID",
+    "transfer_syntax_uid": "TransferSyntaxUID",
+    "referenced_sop_uid": "ReferencedSOPInstanceUID",
+    "file_size": "FileSize",
+}
+
+
+def init_header_index() -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS instance_headers (
+                    item_id BIGINT PRIMARY KEY,
+                    study_uid TEXT NOT NULL,
+                    series_uid TEXT,
+                    sop_uid TEXT NOT NULL,
+                    sop_class_uid TEXT,
+                    modality TEXT,
+                    series_description TEXT,
+                    study_description TEXT,
+                    patient_id TEXT,
+                    transfer_syntax_uid TEXT,
+                    referenced_sop_uid TEXT,
+                    file_size BIGINT,
+                    lane TEXT,
+                    received_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+            cur.execute("ALTER TABLE instance_headers ADD COLUMN IF NOT EXISTS lane TEXT")
+            cur.execute("CREATE INDEX IF NOT EXISTS instance_headers_study_idx ON instance_headers (study_uid)")
+            cur.execute("CREATE INDEX IF NOT EXISTS instance_headers_sop_idx ON instance_headers (sop_uid)")
+
+
+def record_header(
+    item_id: int, study_uid: str, sop_uid: str, header: Dict[str, Any], lane: Optional[str] = None
+) -> None:
+    columns = ["item_id", "study_uid", "sop_uid", *COLUMNS, "lane"]
+    values = [item_id, study_uid, sop_uid, *(header.get(keyword) for keyword in COLUMNS.values()), lane]
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in [*COLUMNS, "lane"])
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"INSERT INTO instance_headers ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON CONFLICT (item_id) DO UPDATE SET {updates}",
+                values,
+            )
+
+
+def get_header(item_id: int) -> Optional[Dict[str, Any]]:
+    with transaction() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT * FROM instance_headers WHERE item_id = %s", (item_id,))
+            row = cur.fetchone()
+    if row is None:
+        return None
+    header = {keyword: row[column] for column, keyword in COLUMNS.items()}
+    header["StudyInstanceUID"] = row["study_uid"]
+    header["SOPInstanceUID"] = row["sop_uid"]
+    return header
+
+
+def get_study_headers(study_uid: str) -> List[Dict[str, Any]]:
+    with transaction() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT * FROM instance_headers WHERE study_uid = %s ORDER BY item_id", (study_uid,))
+            return [dict(row) for row in cur.fetchall()]
+
+
+def clear_header_index() -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE instance_headers")
@@ -0,0 +1,81 @@
+import select
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psycopg2
+from psycopg2 import OperationalError
+
+from db import backoff_delay, connect_unpooled
+from receiver.config import get_config, log_event
+
+
+def notify_channel() -> str:
+    return str(get_config().get("database", {}).get("notify_channel", "edge_queue"))
+
+
+class QueueListener:
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._stats = {"notifications": 0, "wakeups": 0, "timeouts": 0, "reconnects": 0}
+        self._thread = threading.Thread(target=self._run, name="queue-listener", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float) -> bool:
+        with self._cond:
+            generation = self._generation
+            self._cond.wait_for(lambda: self._generation != generation, timeout)
+            woken = self._generation != generation
+            self._stats["wakeups" if woken else "timeouts"] += 1
+            return woken
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"channel": self.channel, **self._stats}
+
+    def _run(self) -> None:
+        attempt = 0
+        while True:
+            conn: Optional[psycopg2.extensions.connection] = None
+            try:
+                conn = connect_unpooled()
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                attempt = 0
+                # Rows may have arrived while we were not listening.
+                self._wake(0)
+                while True:
+                    readable, _, _ = select.select([conn], [], [], 5.0)
+                    if not readable:
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        count = len(conn.notifies)
+                        conn.notifies.clear()
+                        self._wake(count)
+            except (OperationalError, psycopg2.InterfaceError, OSError) as exc:
+                attempt += 1
+                with self._cond:
+                    self._stats["reconnects"] += 1
+                log_event(
+                    "warning",
+                    "db",
+                    study_uid=None,
+                    sop_uid=None,
+                    ae_title=get_config()["edge"]["ae_title"],
+                    remote_ip=None,
+                    outcome="listen_reconnect",
+                    error=str(exc),
+                )
+                time.sleep(backoff_delay(min(attempt, 6)))
+            finally:
+                if conn is not None and conn.closed == 0:
+                    conn.close()
+
+    def _wake(self, count: int) -> None:
+        with self._cond:
+            self._generation += 1
+            self._stats["notifications"] += count
+            self._cond.notify_all()
@@ -0,0 +1,79 @@
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import RealDictCursor
+
+from db import transaction
+
+
+# Parallel-mode PACS forwards that have been acknowledged to the sender but not
+# yet delivered. Each row names the receiver process holding it in memory, so a
+# restarted process recovers only what its previous incarnation lost.
+def init_pacs_pending() -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pacs_pending (
+                    item_id BIGINT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    study_uid TEXT NOT NULL,
+                    sop_uid TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    lane TEXT,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+            cur.execute("ALTER TABLE pacs_pending ADD COLUMN IF NOT EXISTS lane TEXT")
+            cur.execute("CREATE INDEX IF NOT EXISTS pacs_pending_owner_idx ON pacs_pending (owner, item_id)")
+
+
+def add_pacs_pending(
+    item_id: int, owner: str, study_uid: str, sop_uid: str, file_path: str, lane: Optional[str] = None
+) -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO pacs_pending (item_id, owner, study_uid, sop_uid, file_path, lane) "
+                "VALUES (%s, %s, %s, %s, %s, %s) "
+                "ON CONFLICT (item_id) DO UPDATE SET owner = EXCLUDED.owner",
+                (item_id, owner, study_uid, sop_uid, file_path, lane),
+            )
+
+
+def release_pacs_pending(item_id: int) -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM pacs_pending WHERE item_id = %s", (item_id,))
+
+
+def adopt_pacs_pending(owner: str) -> int:
+    # Only safe while no other receiver process is running.
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE pacs_pending SET owner = %s WHERE owner <> %s", (owner, owner))
+            return cur.rowcount
+
+
+def pacs_pending_high_water(owner: str) -> int:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(item_id), 0) FROM pacs_pending WHERE owner = %s", (owner,))
+            return int(cur.fetchone()[0])
+
+
+def list_pacs_pending(owner: str, after_item_id: int, up_to_item_id: int, limit: int) -> List[Dict[str, Any]]:
+    with transaction() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                "SELECT item_id, study_uid, sop_uid, file_path, lane FROM pacs_pending "
+                "WHERE owner = %s AND item_id > %s AND item_id <= %s ORDER BY item_id LIMIT %s",
+                (owner, after_item_id, up_to_item_id, limit),
+            )
+            return [dict(row) for row in cur.fetchall()]
+
+
+def clear_pacs_pending() -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE pacs_pending")
@@ -0,0 +1,48 @@
+from typing import Any, Optional, Tuple
+
+from db import transaction
+from queue_store.queue_manager import mark_result_received
+
+
+def init_result_claims() -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ai_result_claims (
+                    original_sop_uid TEXT PRIMARY KEY,
+                    result_sop_uid TEXT NOT NULL,
+                    received_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+
+
+def receive_result(study_uid: str, sop_uid: str, original_sop_uid: Optional[str]) -> Tuple[bool, Any]:
+    # Hedged dispatch can produce several results for one instance, possibly landing
+    # in different receiver processes. The first one to commit its claim wins; the
+    # claim commits together with the correlation, so a result rejected before that
+    # point does not block a later one. A resend of the winning result is accepted.
+    with transaction() as conn:
+        if original_sop_uid:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO ai_result_claims (original_sop_uid, result_sop_uid) VALUES (%s, %s) "
+                    "ON CONFLICT (original_sop_uid) DO NOTHING",
+                    (original_sop_uid, sop_uid),
+                )
+                if cur.rowcount == 0:
+                    cur.execute(
+                        "SELECT result_sop_uid FROM ai_result_claims WHERE original_sop_uid = %s",
+                        (original_sop_uid,),
+                    )
+                    row = cur.fetchone()
+                    if row is None or row[0] != sop_uid:
+                        return False, None
+        return True, mark_result_received(study_uid, sop_uid)
+
+
+def clear_result_claims() -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE ai_result_claims")
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import RealDictCursor
+
+from db import transaction
+from queue_store.forward_retries import schedule_forward_retry
+from queue_store.header_index import record_header
+from queue_store.models import STATE_FAILED, STATE_FORWARDING, STATE_QUEUED, STATE_SENT
+from queue_store.notify import notify_channel
+from queue_store.pacs_pending import add_pacs_pending, release_pacs_pending
+from queue_store.queue_manager import enqueue, increment_retry, mark_pacs_sent, update_state
+
+# Queue table created by queue_manager.init_db; claims address it directly so a
+# whole batch is taken in one statement.
+QUEUE_TABLE = "queue_items"
+
+
+def enqueue_and_notify(
+    study_uid: str,
+    sop_uid: str,
+    file_path: str,
+    header: Optional[Dict[str, Any]] = None,
+    pacs_owner: Optional[str] = None,
+    lane: Optional[str] = None,
+) -> int:
+    with transaction() as conn:
+        item_id = enqueue(study_uid, sop_uid, file_path)
+        if header is not None:
+            record_header(item_id, study_uid, sop_uid, header, lane)
+        if pacs_owner is not None:
+            add_pacs_pending(item_id, pacs_owner, study_uid, sop_uid, file_path, lane)
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_notify(%s, %s)", (notify_channel(), str(item_id)))
+    return item_id
+
+
+def requeue_and_notify(item_id: int) -> None:
+    with transaction() as conn:
+        update_state(item_id, STATE_QUEUED)
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_notify(%s, %s)", (notify_channel(), str(item_id)))
+
+
+def notify_queued(item_id: int) -> None:
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_notify(%s, %s)", (notify_channel(), str(item_id)))
+
+
+def claim_queued(limit: int, lanes: Optional[List[str]] = None, starvation_seconds: float = 0.0) -> List[Any]:
+    # Lanes are served highest first by the lane recorded at receive time (rows
+    # without one rank last), then in arrival order. One slot per batch goes to
+    # the oldest row once it has waited starvation_seconds, so a STAT stream
+    # cannot starve the routine backlog.
+    lanes = lanes or []
+    ranked = max(1, limit - 1) if starvation_seconds > 0 and limit > 1 else limit
+    with transaction() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # Retries whose backoff has expired rejoin the queue; the rest stay
+            # claimed and are skipped.
+            cur.execute(
+                f"WITH due AS (DELETE FROM forward_retries WHERE next_attempt_at <= now() RETURNING item_id) "
+                f"UPDATE {QUEUE_TABLE} SET state = %s WHERE id IN (SELECT item_id FROM due)",
+                (STATE_QUEUED,),
+            )
+            aged = (
+                f" UNION (SELECT q.id FROM {QUEUE_TABLE} q JOIN instance_headers h ON h.item_id = q.id "
+                f"WHERE q.state = %(queued)s AND h.received_at < now() - %(starvation)s * interval '1 second' "
+                f"ORDER BY q.id LIMIT 1 FOR UPDATE OF q SKIP LOCKED)"
+                if ranked < limit
+                else ""
+            )
+            # SKIP LOCKED lets every consumer thread and process claim its own
+            # batch concurrently without ever taking the same row.
+            cur.execute(
+                f"UPDATE {QUEUE_TABLE} SET state = %(forwarding)s WHERE id IN ("
+                f"(SELECT q.id FROM {QUEUE_TABLE} q LEFT JOIN instance_headers h ON h.item_id = q.id "
+                f"WHERE q.state = %(queued)s "
+                f"ORDER BY COALESCE(array_position(%(lanes)s::text[], h.lane), %(unranked)s), q.id "
+                f"LIMIT %(ranked)s FOR UPDATE OF q SKIP LOCKED){aged}"
+                f") RETURNING *",
+                {
+                    "forwarding": STATE_FORWARDING,
+                    "queued": STATE_QUEUED,
+                    "lanes": lanes,
+                    "unranked": len(lanes) + 1,
+                    "ranked": ranked,
+                    "starvation": starvation_seconds,
+                },
+            )
+            rows = cur.fetchall()
+    return [SimpleNamespace(**row) for row in sorted(rows, key=lambda row: row["id"])]
+
+
+def recover_claimed() -> int:
+    # Only safe while no consumer is running: rows a dead process had claimed
+    # go back to the queue, except retries still waiting out their backoff.
+    with transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"UPDATE {QUEUE_TABLE} SET state = %s WHERE state = %s "
+                f"AND NOT EXISTS (SELECT 1 FROM forward_retries WHERE item_id = {QUEUE_TABLE}.id)",
+                (STATE_QUEUED, STATE_FORWARDING),
+            )
+            return cur.rowcount
+
+
+def mark_pacs_forwarded(item_id: int) -> None:
+    with transaction():
+        mark_pacs_sent(item_id)
+        update_state(item_id, STATE_SENT)
+        release_pacs_pending(item_id)
+
+
+def fail_pacs_forward(item_id: int, error: str) -> None:
+    with transaction():
+        increment_retry(item_id, error)
+        update_state(item_id, STATE_FAILED, last_error=error)
+        release_pacs_pending(item_id)
+
+
+def record_forward_failure(item_id: int, error: str, state: str, **fields: Any) -> None:
+    with transaction():
+        increment_retry(item_id, error)
+        update_state(item_id, state, **fields)
+
+
+def defer_forward_retry(item_id: int, error: str, delay_seconds: float, count_attempt: bool = True) -> None:
+    with transaction():
+        if count_attempt:
+            increment_retry(item_id, error)
+        update_state(item_id, STATE_FORWARDING, last_error=error)
+        schedule_forward_retry(item_id, delay_seconds)
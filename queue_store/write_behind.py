@@ -0,0 +1,205 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+
+from db import get_connection, release_connection
+from receiver.config import get_config, log_event
+
+
+_Op = Tuple[Callable[..., Any], tuple, Dict[str, Any], Future]
+
+
+class WriteBehind:
+    def __init__(self, flush_interval_ms: float, max_batch: int, durable_timeout_seconds: float = 30.0) -> None:
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.durable_timeout = max(0.1, durable_timeout_seconds)
+        self._pending: List[_Op] = []
+        self._cond = threading.Condition()
+        self._stats = {
+            "ops": 0,
+            "batches": 0,
+            "batch_failures": 0,
+            "failed_batches": 0,
+            "op_failures": 0,
+            "max_batch_seen": 0,
+            "commit_seconds_total": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name="queue-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, durable: bool = False, **kwargs: Any) -> Any:
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((fn, args, kwargs, future))
+            # The first op wakes an idle writer, which then waits flush_interval for more.
+            if durable or len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify()
+        if durable:
+            return future.result(timeout=self.durable_timeout)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"pending": len(self._pending), **self._stats}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait()
+                if len(self._pending) < self.max_batch:
+                    self._cond.wait(self.flush_interval)
+                batch = self._pending[: self.max_batch]
+                self._pending = self._pending[self.max_batch :]
+            if not batch:
+                continue
+            try:
+                self._commit(batch)
+            except BaseException as exc:  # noqa: BLE001
+                # This is the only writer thread; if it died every durable submit would hang.
+                self._fail(batch, exc)
+
+    def _commit(self, batch: List[_Op]) -> None:
+        started = time.monotonic()
+        results: List[Any] = []
+        try:
+            conn = get_connection()
+        except BaseException as exc:  # noqa: BLE001
+            self._fail(batch, exc)
+            return
+        try:
+            conn.autocommit = False
+            for fn, args, kwargs, _ in batch:
+                results.append(fn(*args, **kwargs))
+            conn.commit()
+        except Exception as exc:  # noqa: BLE001
+            self._rollback(conn)
+            with self._cond:
+                self._stats["batch_failures"] += 1
+            log_event(
+                "warning",
+                "queue",
+                study_uid=None,
+                sop_uid=None,
+                ae_title=None,
+                remote_ip=None,
+                outcome="batch_retry_individually",
+                batch_size=len(batch),
+                error=str(exc),
+            )
+            self._apply_individually(batch)
+            return
+        finally:
+            if conn.closed == 0 and conn.status == psycopg2.extensions.STATUS_READY:
+                conn.autocommit = True
+
+        for (_, _, _, future), result in zip(batch, results):
+            future.set_result(result)
+        with self._cond:
+            self._stats["ops"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(batch))
+            self._stats["commit_seconds_total"] += time.monotonic() - started
+
+    def _apply_individually(self, batch: List[_Op]) -> None:
+        for fn, args, kwargs, future in batch:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as exc:  # noqa: BLE001
+                # Non-durable callers never read the future, so the failure is reported here.
+                future.set_exception(exc)
+                with self._cond:
+                    self._stats["op_failures"] += 1
+                self._log_op_failure(fn, args, exc)
+        with self._cond:
+            self._stats["ops"] += len(batch)
+
+    def _fail(self, batch: List[_Op], exc: BaseException) -> None:
+        error = exc if isinstance(exc, Exception) else RuntimeError(f"write_behind_failed:{exc!r}")
+        failed = 0
+        for _, _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+                failed += 1
+        with self._cond:
+            self._stats["failed_batches"] += 1
+            self._stats["op_failures"] += failed
+        log_event(
+            "error",
+            "queue",
+            study_uid=None,
+            sop_uid=None,
+            ae_title=None,
+            remote_ip=None,
+            outcome="batch_failed",
+            batch_size=len(batch),
+            ops=sorted({getattr(fn, "__name__", str(fn)) for fn, _, _, _ in batch}),
+            error=str(exc),
+        )
+
+    @staticmethod
+    def _log_op_failure(fn: Callable[..., Any], args: tuple, exc: Exception) -> None:
+        item_id = args[0] if args and isinstance(args[0], int) else None
+        log_event(
+            "error",
+            "queue",
+            study_uid=None,
+            sop_uid=None,
+            ae_title=None,
+            remote_ip=None,
+            outcome="write_failed",
+            op=getattr(fn, "__name__", str(fn)),
+            item_id=item_id,
+            error=str(exc),
+        )
+
+    @staticmethod
+    def _rollback(conn: Any) -> None:
+        try:
+            conn.rollback()
+            conn.autocommit = True
+        except psycopg2.Error:
+            release_connection()
+
+
+_WRITE_BEHIND: Optional[WriteBehind] = None
+_WRITE_BEHIND_LOCK = threading.Lock()
+
+
+def _settings() -> Dict[str, Any]:
+    return get_config().get("database", {}).get("write_behind", {}) or {}
+
+
+def get_write_behind() -> Optional[WriteBehind]:
+    global _WRITE_BEHIND
+    if _WRITE_BEHIND is not None:
+        return _WRITE_BEHIND
+    settings = _settings()
+    if not settings.get("enabled", True):
+        return None
+    with _WRITE_BEHIND_LOCK:
+        if _WRITE_BEHIND is None:
+            _WRITE_BEHIND = WriteBehind(
+                flush_interval_ms=float(settings.get("flush_interval_ms", 5)),
+                max_batch=int(settings.get("max_batch", 200)),
+                durable_timeout_seconds=float(settings.get("durable_timeout_seconds", 30)),
+            )
+    return _WRITE_BEHIND
+
+
+def submit(fn: Callable[..., Any], *args: Any, durable: Optional[bool] = None, **kwargs: Any) -> Any:
+    writer = get_write_behind()
+    if writer is None:
+        return fn(*args, **kwargs)
+    if durable is None:
+        durable = bool(_settings().get("durable_transitions", False))
+    return writer.submit(fn, *args, durable=durable, **kwargs)
+
+
+def write_behind_stats() -> Dict[str, Any]:
+    writer = get_write_behind()
+    return writer.stats() if writer is not None else {"enabled": False}
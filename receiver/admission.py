@@ -0,0 +1,122 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from receiver.config import log_event
+
+
+SIGNALS = ("queue_depth", "disk_free_mb", "db_latency_ms", "in_flight_dispatches")
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        sample: Callable[[], Dict[str, float]],
+        on_change: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        self.interval_seconds = max(0.1, float(config.get("interval_seconds", 1)))
+        self.exempt = {str(aet) for aet in config.get("exempt_calling_aets", [])}
+        # Each signal sheds at shed_at and only resumes once it is back past resume_at.
+        # When shed_at < resume_at (e.g. free disk) low values are the bad ones.
+        self.thresholds: Dict[str, Tuple[float, float]] = {}
+        for name in SIGNALS:
+            limits = config.get(name)
+            if limits:
+                self.thresholds[name] = (float(limits["shed_at"]), float(limits["resume_at"]))
+        self._sample = sample
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._tripped: List[str] = []
+        self._values: Dict[str, float] = {}
+        self._shed_by_reason: Dict[str, int] = {}
+        self._stats = {"shed": 0, "exempted": 0, "transitions": 0, "sample_errors": 0}
+        self._thread = threading.Thread(target=self._run, name="admission", daemon=True)
+        self._thread.start()
+
+    @property
+    def shedding(self) -> bool:
+        with self._lock:
+            return bool(self._tripped)
+
+    def admit(self, calling_aet: str) -> bool:
+        with self._lock:
+            if not self._tripped:
+                return True
+            if calling_aet in self.exempt:
+                self._stats["exempted"] += 1
+                return True
+            self._stats["shed"] += 1
+            for reason in self._tripped:
+                self._shed_by_reason[reason] = self._shed_by_reason.get(reason, 0) + 1
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "shedding": bool(self._tripped),
+                "tripped": list(self._tripped),
+                "values": {name: round(value, 1) for name, value in self._values.items()},
+                "shed_by_reason": dict(self._shed_by_reason),
+                **self._stats,
+            }
+
+    def _run(self) -> None:
+        while True:
+            try:
+                values = self._sample()
+            except Exception as exc:  # noqa: BLE001
+                with self._lock:
+                    self._stats["sample_errors"] += 1
+                log_event(
+                    "warning",
+                    "admission",
+                    study_uid=None,
+                    sop_uid=None,
+                    ae_title=None,
+                    remote_ip=None,
+                    outcome="sample_failed",
+                    error=str(exc),
+                )
+                values = {}
+            self._update(values)
+            time.sleep(self.interval_seconds)
+
+    def _update(self, values: Dict[str, float]) -> None:
+        with self._lock:
+            self._values.update(values)
+            was_shedding = bool(self._tripped)
+            tripped = []
+            for name, (shed_at, resume_at) in self.thresholds.items():
+                value = self._values.get(name)
+                if value is None:
+                    if name in self._tripped:
+                        tripped.append(name)
+                    continue
+                low_is_bad = shed_at < resume_at
+                if name in self._tripped:
+                    recovered = value >= resume_at if low_is_bad else value <= resume_at
+                    if not recovered:
+                        tripped.append(name)
+                elif (value <= shed_at) if low_is_bad else (value >= shed_at):
+                    tripped.append(name)
+            self._tripped = tripped
+            shedding = bool(tripped)
+            if shedding != was_shedding:
+                self._stats["transitions"] += 1
+            values_snapshot = dict(self._values)
+        if shedding == was_shedding:
+            return
+        log_event(
+            "warning" if shedding else "info",
+            "admission",
+            study_uid=None,
+            sop_uid=None,
+            ae_title=None,
+            remote_ip=None,
+            outcome="shedding" if shedding else "admitting",
+            tripped=tripped,
+            values={name: round(value, 1) for name, value in values_snapshot.items()},
+        )
+        if self._on_change is not None:
+            self._on_change(shedding)
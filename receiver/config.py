@@ -1,20 +1,39 @@
+import atexit
 import json
-import logging
 import os
+import random
+import sys
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 import yaml
 
 _CONFIG_CACHE: Dict[str, Any] | None = None
-_LOGGER: logging.Logger | None = None
+_CONFIG_STAMP: Tuple[int, int] | None = None
+_CONFIG_CHECKED_AT = 0.0
+_RELOAD_LOCK = threading.Lock()
+_EVENT_WRITER: "_AsyncEventWriter | None" = None
+_EVENT_WRITER_LOCK = threading.Lock()
+
+CONFIG_RECHECK_SECONDS = 0.5
+
+
+def _file_stamp(config_path: str) -> Tuple[int, int]:
+    stat = os.stat(config_path)
+    return stat.st_mtime_ns, stat.st_size
 
 
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
-    global _CONFIG_CACHE
+    global _CONFIG_CACHE, _CONFIG_STAMP, _CONFIG_CHECKED_AT
+    stamp = _file_stamp(config_path)
     with open(config_path, "r", encoding="utf-8") as f:
-        _CONFIG_CACHE = yaml.safe_load(f)
-    return _CONFIG_CACHE
+        config = yaml.safe_load(f)
+    _CONFIG_CACHE = config
+    _CONFIG_STAMP = stamp
+    _CONFIG_CHECKED_AT = time.monotonic()
+    return config
 
 
 def get_config() -> Dict[str, Any]:
@@ -23,6 +42,33 @@ def get_config() -> Dict[str, Any]:
     return _CONFIG_CACHE
 
 
+def get_current_config(config_path: str = "config.yaml") -> Dict[str, Any]:
+    global _CONFIG_CACHE, _CONFIG_STAMP, _CONFIG_CHECKED_AT
+    config = _CONFIG_CACHE
+    if config is None:
+        return load_config(config_path)
+    if time.monotonic() - _CONFIG_CHECKED_AT < CONFIG_RECHECK_SECONDS:
+        return config
+    if not _RELOAD_LOCK.acquire(blocking=False):
+        return config
+    try:
+        _CONFIG_CHECKED_AT = time.monotonic()
+        stamp = _file_stamp(config_path)
+        if stamp == _CONFIG_STAMP:
+            return config
+        with open(config_path, "r", encoding="utf-8") as f:
+            fresh = yaml.safe_load(f)
+        # cli.py rewrites config.yaml in place, so a read can race a partial write.
+        if isinstance(fresh, dict) and set(config).issubset(fresh):
+            _CONFIG_CACHE = fresh
+            _CONFIG_STAMP = stamp
+    except (OSError, yaml.YAMLError):
+        pass
+    finally:
+        _RELOAD_LOCK.release()
+    return _CONFIG_CACHE
+
+
 def ensure_directories(config: Dict[str, Any]) -> None:
     data_root = config["edge"]["data_root"]
     for sub in ["incoming", "queued", "sent", "failed"]:
@@ -33,45 +79,107 @@ def ensure_directories(config: Dict[str, Any]) -> None:
     os.makedirs(os.path.dirname(sqlite_path), exist_ok=True)
 
 
-def get_logger() -> logging.Logger:
-    global _LOGGER
-    if _LOGGER is not None:
-        return _LOGGER
-
-    logger = logging.getLogger("edge")
-    logger.setLevel(logging.INFO)
-    logger.handlers = []
-    logger.propagate = False
-
-    config = get_config()
-    log_path = config["edge"]["log_path"]
-
-    file_handler = logging.FileHandler(log_path)
-    stream_handler = logging.StreamHandler()
-
-    formatter = logging.Formatter("%(message)s")
-    file_handler.setFormatter(formatter)
-    stream_handler.setFormatter(formatter)
-
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
-
-    _LOGGER = logger
-    return logger
+class _AsyncEventWriter:
+    def __init__(self, config: Dict[str, Any]) -> None:
+        log_config = config.get("logging", {}) or {}
+        self.buffer_size = int(log_config.get("buffer_size", 10000))
+        self.batch_size = int(log_config.get("batch_size", 256))
+        self.flush_interval = float(log_config.get("flush_interval_ms", 200)) / 1000.0
+        self.sample_rates = {
+            str(stage): float(rate) for stage, rate in (log_config.get("info_sample_rate", {}) or {}).items()
+        }
+        self._file = open(config["edge"]["log_path"], "a", encoding="utf-8")
+        self._buffer: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._stats = {"written": 0, "dropped": 0, "sampled_out": 0, "batches": 0}
+        self._reported_dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, level: str, stage: str, payload: Dict[str, Any]) -> None:
+        if level == "info":
+            rate = self.sample_rates.get(stage, 1.0)
+            if rate < 1.0 and random.random() >= rate:
+                with self._cond:
+                    self._stats["sampled_out"] += 1
+                return
+        with self._cond:
+            if len(self._buffer) >= self.buffer_size:
+                self._stats["dropped"] += 1
+                return
+            self._buffer.append(payload)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._cond:
+                batch, self._buffer = self._buffer, []
+                dropped = self._stats["dropped"] - self._reported_dropped
+                self._reported_dropped = self._stats["dropped"]
+            if dropped:
+                batch.append(
+                    {
+                        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                        "level": "warning",
+                        "stage": "logging",
+                        "outcome": "dropped",
+                        "count": dropped,
+                        "error": "log_buffer_full",
+                    }
+                )
+            if not batch:
+                return
+            text = "".join(json.dumps(payload, separators=(",", ":"), default=str) + "\n" for payload in batch)
+            self._file.write(text)
+            self._file.flush()
+            sys.stderr.write(text)
+            sys.stderr.flush()
+            with self._cond:
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"buffered": len(self._buffer), "buffer_size": self.buffer_size, **self._stats}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+            try:
+                self.flush()
+            except (OSError, ValueError):
+                pass
+
+
+def _get_event_writer() -> _AsyncEventWriter:
+    global _EVENT_WRITER
+    if _EVENT_WRITER is not None:
+        return _EVENT_WRITER
+    with _EVENT_WRITER_LOCK:
+        if _EVENT_WRITER is None:
+            _EVENT_WRITER = _AsyncEventWriter(get_config())
+            atexit.register(flush_logs)
+    return _EVENT_WRITER
+
+
+def flush_logs() -> None:
+    if _EVENT_WRITER is not None:
+        _EVENT_WRITER.flush()
+
+
+def log_stats() -> Dict[str, Any]:
+    return _get_event_writer().stats()
 
 
 def log_event(level: str, stage: str, **fields: Any) -> None:
-    logger = get_logger()
     payload = {
         "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
         "level": level,
         "stage": stage,
         **fields,
     }
-    message = json.dumps(payload, separators=(",", ":"))
-    if level.lower() == "error":
-        logger.error(message)
-    elif level.lower() == "warning":
-        logger.warning(message)
-    else:
-        logger.info(message)
+    _get_event_writer().submit(level.lower(), stage, payload)
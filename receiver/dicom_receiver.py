@@ -1,23 +1,104 @@
+import multiprocessing
+import shutil
+import signal
+import socket
+import sys
 import threading
+import time
+from typing import Any, Callable, Dict, Tuple
 
-from pynetdicom import AE, evt
+from pynetdicom import AE, _config, evt
 from pynetdicom.sop_class import CTImageStorage, MRImageStorage, SecondaryCaptureImageStorage
+from pynetdicom.transport import AssociationServer
 
+from db import pool_stats, release_connection
 from forwarder.forwarder import Forwarder
-from queue_store.queue_manager import init_db
-from receiver.config import ensure_directories, load_config, log_event
-from receiver.handlers import handle_echo, handle_store, set_forwarder
+from forwarder.rules import get_routing_table
+from queue_store.forward_retries import init_forward_retries
+from queue_store.header_index import init_header_index
+from queue_store.models import STATE_FORWARDING, STATE_QUEUED
+from queue_store.pacs_pending import adopt_pacs_pending, init_pacs_pending
+from queue_store.queue_manager import get_counts, init_db
+from queue_store.results import init_result_claims
+from queue_store.transitions import recover_claimed
+from queue_store.write_behind import write_behind_stats
+from receiver import metrics
+from receiver.admission import AdmissionController
+from receiver.config import ensure_directories, flush_logs, load_config, log_event, log_stats
+from receiver.handlers import (
+    handle_echo,
+    handle_store,
+    in_flight_dispatches,
+    recover_pending_pacs_forwards,
+    set_admission,
+    set_forwarder,
+    set_pacs_owner,
+    start_worker_dispatch,
+)
+from receiver.storage import use_chunk_dir
+
+
+def _admission_sample(data_root: str) -> Dict[str, float]:
+    values: Dict[str, float] = {
+        "disk_free_mb": shutil.disk_usage(data_root).free / (1024 * 1024),
+        "in_flight_dispatches": float(in_flight_dispatches()),
+    }
+    started = time.monotonic()
+    try:
+        counts = get_counts()
+        values["queue_depth"] = float(counts.get(STATE_QUEUED, 0) + counts.get(STATE_FORWARDING, 0))
+        values["db_latency_ms"] = (time.monotonic() - started) * 1000.0
+    except Exception:  # noqa: BLE001
+        # An unreachable database counts as infinitely slow.
+        values["db_latency_ms"] = float("inf")
+    finally:
+        release_connection()
+    return values
+
+
+class ReusePortAssociationServer(AssociationServer):
+    # Every receiver process binds the same port; the kernel spreads new
+    # connections across them.
+    def server_bind(self) -> None:
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
 
 
 def start_receiver() -> None:
+    config = load_config()
+    processes = int(config["edge"].get("processes", 1))
+    if processes <= 1:
+        run_receiver()
+        return
+    _supervise(config, processes)
+
+
+def run_receiver(process_name: str | None = None, reuse_port: bool = False, run_forwarder: bool = True) -> None:
     config = load_config()
     ensure_directories(config)
-    init_db()
+    if process_name is None:
+        init_db()
+        init_header_index()
+        init_result_claims()
+        init_pacs_pending()
+        init_forward_retries()
+        _recover_claimed(config)
+        # Single process: every pending PACS forward was left by a previous run.
+        adopt_pacs_pending("receiver")
+        metrics.clear_published()
+    else:
+        metrics.set_process_name(process_name)
+    set_pacs_owner(process_name or "receiver")
 
     ae_title = config["edge"]["ae_title"]
     port = int(config["edge"]["port"])
+    _config.STORE_RECV_CHUNKED_DATASET = bool(config["edge"].get("store_chunked", True))
+    if _config.STORE_RECV_CHUNKED_DATASET:
+        use_chunk_dir(config["edge"]["data_root"])
 
     ae = AE(ae_title=ae_title)
+    max_associations = int(config["edge"].get("max_associations", 10))
+    ae.maximum_associations = max_associations
     ae.add_supported_context(CTImageStorage)
     ae.add_supported_context(MRImageStorage)
     ae.add_supported_context(SecondaryCaptureImageStorage)
@@ -29,11 +110,180 @@ def start_receiver() -> None:
 
     forwarder = Forwarder()
     set_forwarder(forwarder)
+    _register_forwarder_metrics(forwarder)
+
+    admission_config = config["edge"].get("admission", {})
+    if admission_config.get("enabled", False):
+        refuse_associations = str(admission_config.get("shed", "instance")).lower() in {"association", "both"}
+        shed_max_associations = int(admission_config.get("shed_max_associations", 1))
+
+        def _on_admission_change(shedding: bool) -> None:
+            if refuse_associations:
+                ae.maximum_associations = shed_max_associations if shedding else max_associations
+
+        admission = AdmissionController(
+            admission_config,
+            sample=lambda: _admission_sample(config["edge"]["data_root"]),
+            on_change=_on_admission_change,
+        )
+        set_admission(admission)
+        metrics.register("admission", admission.stats)
+    metrics.start_publisher(float(config["edge"].get("metrics_interval_seconds", 5)))
     if forwarder.mode != "parallel":
-        threading.Thread(target=forwarder.run, daemon=True).start()
+        if run_forwarder:
+            threading.Thread(target=forwarder.run, daemon=True).start()
+    else:
+        start_worker_dispatch()
+        recover_pending_pacs_forwards()
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    log_event(
+        "info",
+        "receive",
+        study_uid=None,
+        sop_uid=None,
+        ae_title=ae_title,
+        remote_ip=None,
+        process=process_name,
+        outcome="listening",
+        error=None,
+    )
+    try:
+        if reuse_port:
+            # start_server() has no server_class hook; this mirrors its blocking path.
+            server = ae.make_server(("0.0.0.0", port), evt_handlers=handlers, server_class=ReusePortAssociationServer)
+            try:
+                server.serve_forever()
+            finally:
+                server.server_close()
+        else:
+            ae.start_server(("0.0.0.0", port), block=True, evt_handlers=handlers)
+    finally:
+        flush_logs()
+
+
+def run_forwarder(process_name: str) -> None:
+    config = load_config()
+    ensure_directories(config)
+    metrics.set_process_name(process_name)
+    forwarder = Forwarder()
+    _register_forwarder_metrics(forwarder)
+    metrics.start_publisher(float(config["edge"].get("metrics_interval_seconds", 5)))
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        forwarder.run()
+    finally:
+        flush_logs()
+
+
+def _recover_claimed(config: Dict[str, Any]) -> None:
+    # No consumer is running yet, so anything still claimed was lost by the last run.
+    requeued = recover_claimed()
+    if requeued:
+        log_event(
+            "warning",
+            "queue",
+            study_uid=None,
+            sop_uid=None,
+            ae_title=config["edge"]["ae_title"],
+            remote_ip=None,
+            outcome="claims_recovered",
+            count=requeued,
+            error=None,
+        )
+
+
+def _register_forwarder_metrics(forwarder: Forwarder) -> None:
+    metrics.register("association_pools", forwarder.pool_stats)
+    metrics.register("workers", forwarder.worker_stats)
+    metrics.register("breakers", forwarder.breaker_stats)
+    metrics.register("destination_rate_limits", forwarder.rate_limit_stats)
+    metrics.register("routing", lambda: get_routing_table().stats())
+    metrics.register("logging", log_stats)
+    metrics.register("db_pool", pool_stats)
+    metrics.register("queue_write_behind", write_behind_stats)
+
+
+def _supervise(config: Dict[str, Any], processes: int) -> None:
+    ensure_directories(config)
+    init_db()
+    init_header_index()
+    init_result_claims()
+    init_pacs_pending()
+    init_forward_retries()
+    _recover_claimed(config)
+    metrics.clear_published()
+    # Queue-driven modes claim rows under an advisory lock, so forwarding can
+    # move to its own processes; parallel mode forwards from each receiver.
+    mode = str(config.get("forwarder", {}).get("mode", "dummy")).lower()
+    forwarder_processes = 0 if mode == "parallel" else max(1, int(config["forwarder"].get("processes", 1)))
+
+    ctx = multiprocessing.get_context("spawn")
+    specs: Dict[str, Tuple[Callable[..., None], tuple]] = {}
+    for idx in range(processes):
+        name = f"receiver-{idx}"
+        specs[name] = (run_receiver, (name, True, False))
+    # Nothing is running yet, so pending parallel-mode PACS forwards from the last
+    # run are handed to receiver-0 once. Restarted children only recover rows they
+    # owned themselves, never rows a live sibling still holds in memory.
+    adopt_pacs_pending("receiver-0")
+    for idx in range(forwarder_processes):
+        name = f"forwarder-{idx}"
+        specs[name] = (run_forwarder, (name,))
+
+    children: Dict[str, multiprocessing.process.BaseProcess] = {}
+    stopping = False
+
+    def _spawn(name: str) -> None:
+        target, args = specs[name]
+        child = ctx.Process(target=target, args=args, name=name)
+        child.start()
+        children[name] = child
+
+    def _stop(*_: Any) -> None:
+        nonlocal stopping
+        stopping = True
 
-    log_event("info", "receive", study_uid=None, sop_uid=None, ae_title=ae_title, remote_ip=None, outcome="listening", error=None)
-    ae.start_server(("0.0.0.0", port), block=True, evt_handlers=handlers)
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    for name in specs:
+        _spawn(name)
+    log_event(
+        "info",
+        "supervisor",
+        study_uid=None,
+        sop_uid=None,
+        ae_title=config["edge"]["ae_title"],
+        remote_ip=None,
+        outcome="started",
+        receivers=processes,
+        forwarders=forwarder_processes,
+    )
+    try:
+        while not stopping:
+            time.sleep(1.0)
+            for name, child in list(children.items()):
+                if child.is_alive() or stopping:
+                    continue
+                log_event(
+                    "error",
+                    "supervisor",
+                    study_uid=None,
+                    sop_uid=None,
+                    ae_title=config["edge"]["ae_title"],
+                    remote_ip=None,
+                    process=name,
+                    outcome="restarting",
+                    error=f"exit_code:{child.exitcode}",
+                )
+                _spawn(name)
+    finally:
+        for child in children.values():
+            if child.is_alive():
+                child.terminate()
+        for child in children.values():
+            child.join(timeout=10)
+        flush_logs()
 
 
 if __name__ == "__main__":
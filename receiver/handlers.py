@@ -1,24 +1,43 @@
 import os
 import threading
-from typing import Any, Optional
+import time
+from typing import Any, Dict, FrozenSet, List, Optional
 
-import pydicom
 from pynetdicom import evt
 
+from db import release_connection
 from fault_injector.faults import FaultError, apply_faults, simulate_disk_full
+from forwarder.batching import StudyBatcher
+from forwarder.dispatch import BoundedExecutor, DispatchSpool
 from forwarder.forwarder import ForwardError, Forwarder
-from queue_store.models import AI_STATUS_FAILED, AI_STATUS_TIMEOUT, STATE_FAILED, STATE_SENT
-from queue_store.queue_manager import (
-    enqueue,
-    mark_ai_status,
-    mark_pacs_sent,
-    mark_result_received,
-    update_state,
-)
+from forwarder.outbox import RetryOutbox
+from forwarder.priority import PriorityRules
+from forwarder.ratelimit import TokenBucket
+from forwarder.rules import Route, get_routing_table
+from queue_store import write_behind
+from queue_store.models import AI_STATUS_FAILED, AI_STATUS_TIMEOUT, STATE_QUEUED
+from queue_store.queue_manager import mark_ai_status
+from queue_store.results import receive_result
+from queue_store.pacs_pending import list_pacs_pending, pacs_pending_high_water
+from queue_store.transitions import enqueue_and_notify, fail_pacs_forward, mark_pacs_forwarded, record_forward_failure
+from receiver import metrics
+from receiver.admission import AdmissionController
 from receiver.config import get_config, log_event
+from receiver.storage import ReceivedInstance
 
 
 _FORWARDER: Optional[Forwarder] = None
+_DISPATCHER: Optional[BoundedExecutor] = None
+_SPOOL: Optional[DispatchSpool] = None
+_PACS_STAGE: Optional[BoundedExecutor] = None
+_PACS_OUTBOX: Optional[RetryOutbox] = None
+_BATCHER: Optional[StudyBatcher] = None
+_PACS_OWNER = "receiver"
+_PRIORITY_RULES: Optional[PriorityRules] = None
+_SOURCE_LIMITS: Dict[str, TokenBucket] = {}
+_ADMISSION: Optional[AdmissionController] = None
+_DISPATCH_LOCK = threading.Lock()
+_DISPATCH_FIELDS = ("item_id", "source_path", "study_uid", "sop_uid", "called_aet", "calling_aet", "remote_ip")
 
 
 def set_forwarder(forwarder: Forwarder) -> None:
@@ -26,6 +45,27 @@ def set_forwarder(forwarder: Forwarder) -> None:
     _FORWARDER = forwarder
 
 
+def set_pacs_owner(owner: str) -> None:
+    global _PACS_OWNER
+    _PACS_OWNER = owner
+
+
+def set_admission(admission: AdmissionController) -> None:
+    global _ADMISSION
+    _ADMISSION = admission
+
+
+def in_flight_dispatches() -> int:
+    total = 0
+    for stage in (_DISPATCHER, _PACS_STAGE):
+        if stage is not None:
+            stage_stats = stage.stats()
+            total += stage_stats["queued"] + stage_stats["active"]
+    if _BATCHER is not None:
+        total += _BATCHER.stats()["pending_items"]
+    return total
+
+
 def _get_forwarder() -> Forwarder:
     global _FORWARDER
     if _FORWARDER is None:
@@ -33,21 +73,231 @@ def _get_forwarder() -> Forwarder:
     return _FORWARDER
 
 
-def _log_receive(study_uid: str, sop_uid: str, called_aet: str, calling_aet: str, remote_ip: str | None) -> None:
+def _get_priority_rules() -> PriorityRules:
+    global _PRIORITY_RULES
+    if _PRIORITY_RULES is None:
+        _PRIORITY_RULES = PriorityRules(get_config().get("forwarder", {}).get("priority", {}))
+    return _PRIORITY_RULES
+
+
+def _fairness_kwargs() -> Dict[str, Any]:
+    fairness_config = get_config().get("forwarder", {}).get("fairness", {})
+    return {
+        "flow_weights": fairness_config.get("weights") or {},
+        "default_flow_weight": float(fairness_config.get("default_weight", 1)),
+    }
+
+
+def _source_limit(calling_aet: str) -> TokenBucket:
+    with _DISPATCH_LOCK:
+        bucket = _SOURCE_LIMITS.get(calling_aet)
+        if bucket is None:
+            limit_config = get_config()["edge"].get("ingest_rate_limit", {})
+            override = (limit_config.get("per_aet") or {}).get(calling_aet, {})
+            bucket = TokenBucket(
+                float(override.get("rate_per_second", limit_config.get("rate_per_second", 0))),
+                float(override.get("burst", limit_config.get("burst", 200))),
+            )
+            if not _SOURCE_LIMITS:
+                metrics.register("ingest_rate_limits", _source_limit_stats)
+            _SOURCE_LIMITS[calling_aet] = bucket
+        return bucket
+
+
+def _source_limit_stats() -> Dict[str, Any]:
+    with _DISPATCH_LOCK:
+        buckets = dict(_SOURCE_LIMITS)
+    return {aet: bucket.stats() for aet, bucket in buckets.items()}
+
+
+def _dispatch_config() -> Dict[str, Any]:
+    return get_config().get("forwarder", {}).get("dispatch", {})
+
+
+def _get_dispatcher() -> BoundedExecutor:
+    global _DISPATCHER, _SPOOL
+    with _DISPATCH_LOCK:
+        if _DISPATCHER is None:
+            dispatch_config = _dispatch_config()
+            rules = _get_priority_rules()
+            _DISPATCHER = BoundedExecutor(
+                "worker_dispatch",
+                pool_size=int(dispatch_config.get("pool_size", 8)),
+                queue_depth=int(dispatch_config.get("queue_depth", 256)),
+                lanes=rules.lanes,
+                default_lane=rules.default_lane,
+                starvation_seconds=rules.starvation_seconds,
+                **_fairness_kwargs(),
+            )
+            metrics.register("worker_dispatch", _DISPATCHER.stats)
+            if str(dispatch_config.get("overflow", "block")).lower() == "spill":
+                spool_dir = os.path.join(get_config()["edge"]["data_root"], "spill", "worker_dispatch")
+                _SPOOL = DispatchSpool(spool_dir)
+                metrics.register("worker_dispatch_spool", _SPOOL.stats)
+                threading.Thread(target=_redrive_spool, args=(_DISPATCHER, _SPOOL), daemon=True).start()
+        return _DISPATCHER
+
+
+def start_worker_dispatch() -> None:
+    # Spilled dispatches from a previous run are redriven without waiting for
+    # the first instance to arrive.
+    _get_dispatcher()
+
+
+def _redrive_spool(dispatcher: BoundedExecutor, spool: DispatchSpool) -> None:
+    def _submit(payload: Dict[str, Any]) -> bool:
+        args = tuple(payload[field] for field in _DISPATCH_FIELDS)
+        workers = frozenset(payload["workers"]) if payload.get("workers") else None
+        return dispatcher.submit(
+            _send_worker_async, *args, workers, block=False, lane=payload.get("lane"), flow=payload.get("calling_aet")
+        )
+
+    while True:
+        if dispatcher.has_capacity():
+            try:
+                spool.redrive(_submit)
+            except OSError:
+                pass
+        time.sleep(1.0)
+
+
+def _dispatch_worker(
+    item_id: int,
+    source_path: str,
+    study_uid: str,
+    sop_uid: str,
+    called_aet: str,
+    calling_aet: str,
+    remote_ip: str | None,
+    lane: str | None = None,
+    workers: Optional[FrozenSet[str]] = None,
+) -> None:
+    dispatcher = _get_dispatcher()
+    args = (item_id, source_path, study_uid, sop_uid, called_aet, calling_aet, remote_ip)
+    if _SPOOL is not None:
+        if dispatcher.submit(_send_worker_async, *args, workers, block=False, lane=lane, flow=calling_aet):
+            return
+        _SPOOL.spill(
+            str(item_id),
+            {**dict(zip(_DISPATCH_FIELDS, args)), "lane": lane, "workers": sorted(workers) if workers else None},
+        )
+        outcome = "spilled"
+    else:
+        timeout = _dispatch_config().get("block_timeout_seconds", 30)
+        if dispatcher.submit(
+            _send_worker_async,
+            *args,
+            workers,
+            block=True,
+            timeout=None if timeout is None else float(timeout),
+            lane=lane,
+            flow=calling_aet,
+        ):
+            return
+        write_behind.submit(mark_ai_status, item_id, AI_STATUS_FAILED, "dispatch_queue_full")
+        outcome = AI_STATUS_FAILED
     log_event(
-        "info",
-        "receive",
+        "warning" if outcome == "spilled" else "error",
+        "forward_worker",
         study_uid=study_uid,
         sop_uid=sop_uid,
         ae_title=called_aet,
         calling_aet=calling_aet,
         remote_ip=remote_ip,
-        outcome="accepted",
-        error=None,
+        outcome=outcome,
+        error="dispatch_queue_full",
     )
 
 
-def _send_worker_async(
+def _pacs_ack_mode() -> str:
+    return str(get_config().get("forwarder", {}).get("pacs_ack", "durable")).lower()
+
+
+def _get_pacs_stage() -> BoundedExecutor:
+    global _PACS_STAGE
+    with _DISPATCH_LOCK:
+        if _PACS_STAGE is None:
+            stage_config = get_config().get("forwarder", {}).get("pacs_forward", {})
+            rules = _get_priority_rules()
+            _PACS_STAGE = BoundedExecutor(
+                "pacs_forward",
+                pool_size=int(stage_config.get("concurrency", 4)),
+                queue_depth=int(stage_config.get("queue_depth", 512)),
+                lanes=rules.lanes,
+                default_lane=rules.default_lane,
+                starvation_seconds=rules.starvation_seconds,
+                **_fairness_kwargs(),
+            )
+            metrics.register("pacs_forward", _PACS_STAGE.stats)
+        return _PACS_STAGE
+
+
+def _get_pacs_outbox() -> RetryOutbox:
+    global _PACS_OUTBOX
+    with _DISPATCH_LOCK:
+        if _PACS_OUTBOX is None:
+            outbox_config = get_config().get("forwarder", {}).get("pacs_outbox", {})
+            _PACS_OUTBOX = RetryOutbox(
+                "pacs_outbox",
+                redrive=_redrive_pacs,
+                max_retries=int(outbox_config.get("max_retries", 10)),
+                backoff_base_seconds=float(outbox_config.get("backoff_base_seconds", 2)),
+                backoff_max_seconds=float(outbox_config.get("backoff_max_seconds", 300)),
+                jitter=float(outbox_config.get("jitter", 0.2)),
+                drain_rate_per_second=float(outbox_config.get("drain_rate_per_second", 20)),
+                drain_burst=float(outbox_config.get("drain_burst", 20)),
+            )
+            metrics.register("pacs_outbox", _PACS_OUTBOX.stats)
+        return _PACS_OUTBOX
+
+
+def _redrive_pacs(*args: Any, attempt: int) -> None:
+    # The lane rides along with the outbox payload so a retry keeps its priority.
+    *args, lane = args
+    _get_pacs_stage().submit(_forward_pacs, *args, lane, attempt, lane=lane, flow=args[5])
+
+
+def _batching_config() -> Dict[str, Any]:
+    return get_config().get("forwarder", {}).get("batching", {})
+
+
+def _get_batcher() -> Optional[StudyBatcher]:
+    global _BATCHER
+    batching_config = _batching_config()
+    # Batches are forwarded after the ACK, so they only apply to durable PACS acks.
+    if not batching_config.get("enabled", False) or _pacs_ack_mode() != "durable":
+        return None
+    with _DISPATCH_LOCK:
+        if _BATCHER is None:
+            _BATCHER = StudyBatcher(
+                "study_batch",
+                _flush_batch,
+                quiet_seconds=float(batching_config.get("quiet_period_ms", 500)) / 1000.0,
+                max_batch=int(batching_config.get("max_batch", 100)),
+                max_wait_seconds=float(batching_config.get("max_wait_seconds", 5)),
+            )
+            metrics.register("study_batching", _BATCHER.stats)
+        return _BATCHER
+
+
+def _batch_key(lane: str, route: Route, study_uid: str, header: Dict[str, Any]) -> tuple:
+    if str(_batching_config().get("group_by", "series")).lower() == "study":
+        return (lane, route.destination, route.workers, study_uid)
+    return (lane, route.destination, route.workers, study_uid, header.get("SeriesInstanceUID") or "unknown")
+
+
+def _flush_batch(key: tuple, batch: List[tuple]) -> None:
+    lane, destination, workers = key[:3]
+    calling_aet = batch[0][5]
+    _get_pacs_stage().submit(_forward_pacs_batch, batch, lane, lane=lane, flow=calling_aet)
+    if destination != "workers":
+        return
+    if not _get_dispatcher().submit(_send_worker_batch, batch, workers, block=False, lane=lane, flow=calling_aet):
+        for args in batch:
+            _dispatch_worker(*args, lane=lane, workers=workers)
+
+
+def _forward_pacs(
     item_id: int,
     source_path: str,
     study_uid: str,
@@ -55,60 +305,221 @@ def _send_worker_async(
     called_aet: str,
     calling_aet: str,
     remote_ip: str | None,
+    lane: str | None = None,
+    attempt: int = 0,
 ) -> None:
+    forwarder = _get_forwarder()
+    args = (item_id, source_path, study_uid, sop_uid, called_aet, calling_aet, remote_ip)
+    try:
+        try:
+            forwarder.send_to_orthanc(source_path)
+        except ForwardError as exc:
+            _record_pacs_result(args, str(exc), attempt, lane)
+        else:
+            _record_pacs_result(args, None, attempt, lane)
+    finally:
+        release_connection()
+
+
+def _forward_pacs_batch(batch: List[tuple], lane: str | None = None) -> None:
     forwarder = _get_forwarder()
     try:
-        worker = forwarder.send_to_worker(source_path, item_id)
+        errors = forwarder.send_batch_to_orthanc([args[1] for args in batch])
+        for args, error in zip(batch, errors):
+            _record_pacs_result(args, error, 0, lane)
+    finally:
+        release_connection()
+
+
+def _record_pacs_result(args: tuple, error: str | None, attempt: int, lane: str | None = None) -> None:
+    item_id, _, study_uid, sop_uid, called_aet, calling_aet, remote_ip = args
+    if error is None:
+        write_behind.submit(mark_pacs_forwarded, item_id)
         log_event(
             "info",
-            "forward_worker",
+            "forward_pacs",
             study_uid=study_uid,
             sop_uid=sop_uid,
             ae_title=called_aet,
             calling_aet=calling_aet,
-            worker=worker,
             remote_ip=remote_ip,
             outcome="sent",
             error=None,
         )
-    except ForwardError as exc:
-        message = str(exc)
-        status = AI_STATUS_TIMEOUT if "timeout" in message else AI_STATUS_FAILED
-        mark_ai_status(item_id, status, message)
+        return
+    # An open breaker rejects locally, so it does not use up one of the item's retries.
+    circuit_open = error.endswith("circuit_open")
+    next_attempt = attempt if circuit_open else attempt + 1
+    retrying = _get_pacs_outbox().schedule(next_attempt, (*args, lane))
+    if not retrying:
+        write_behind.submit(fail_pacs_forward, item_id, error)
+    elif not circuit_open:
+        write_behind.submit(record_forward_failure, item_id, error, STATE_QUEUED, last_error=error)
+    log_event(
+        "warning" if retrying else "error",
+        "forward_pacs",
+        study_uid=study_uid,
+        sop_uid=sop_uid,
+        ae_title=called_aet,
+        calling_aet=calling_aet,
+        remote_ip=remote_ip,
+        outcome="retry_scheduled" if retrying else "failed",
+        attempt=next_attempt,
+        error=error,
+    )
+
+
+def recover_pending_pacs_forwards() -> None:
+    if _pacs_ack_mode() != "durable":
+        return
+    # Rows above the high-water mark are enqueued by this run and already in memory.
+    # The mark is taken before the listener starts; the backlog drains in the background.
+    high_water = pacs_pending_high_water(_PACS_OWNER)
+    if high_water:
+        threading.Thread(target=_recover_pending_pacs_forwards, args=(high_water,), name="pacs_recovery", daemon=True).start()
+
+
+def _recover_pending_pacs_forwards(high_water: int) -> None:
+    try:
+        _drain_pending_pacs_forwards(high_water)
+    finally:
+        release_connection()
+
+
+def _drain_pending_pacs_forwards(high_water: int) -> None:
+    stage = _get_pacs_stage()
+    ae_title = get_config()["edge"]["ae_title"]
+    recovered = 0
+    # Runs alongside live traffic: half of the stage queue stays free for new
+    # C-STORE forwards, so a large backlog never makes handlers block.
+    reserve = stage.queue_depth // 2
+    # Only rows owned by this process: siblings still hold theirs in memory.
+    batch_size = max(1, stage.queue_depth - reserve)
+    rows = list_pacs_pending(_PACS_OWNER, 0, high_water, batch_size)
+    while rows:
+        for row in rows:
+            args = (row["item_id"], row["file_path"], row["study_uid"], row["sop_uid"], ae_title, None, None)
+            while not (
+                stage.has_capacity(reserve)
+                and stage.submit(_forward_pacs, *args, row["lane"], block=False, lane=row["lane"])
+            ):
+                time.sleep(0.5)
+        recovered += len(rows)
+        rows = list_pacs_pending(_PACS_OWNER, rows[-1]["item_id"], high_water, batch_size)
+    if recovered:
         log_event(
-            "error",
-            "forward_worker",
-            study_uid=study_uid,
-            sop_uid=sop_uid,
-            ae_title=called_aet,
-            calling_aet=calling_aet,
-            remote_ip=remote_ip,
-            outcome=status,
-            error=message,
+            "info",
+            "forward_pacs",
+            study_uid=None,
+            sop_uid=None,
+            ae_title=ae_title,
+            remote_ip=None,
+            outcome="recovered",
+            count=recovered,
+            error=None,
         )
-    except Exception as exc:  # noqa: BLE001
-        message = str(exc)
-        mark_ai_status(item_id, AI_STATUS_FAILED, message)
+
+
+def _log_receive(study_uid: str, sop_uid: str, called_aet: str, calling_aet: str, remote_ip: str | None) -> None:
+    log_event(
+        "info",
+        "receive",
+        study_uid=study_uid,
+        sop_uid=sop_uid,
+        ae_title=called_aet,
+        calling_aet=calling_aet,
+        remote_ip=remote_ip,
+        outcome="accepted",
+        error=None,
+    )
+
+
+def _send_worker_async(
+    item_id: int,
+    source_path: str,
+    study_uid: str,
+    sop_uid: str,
+    called_aet: str,
+    calling_aet: str,
+    remote_ip: str | None,
+    workers: Optional[FrozenSet[str]] = None,
+) -> None:
+    forwarder = _get_forwarder()
+    args = (item_id, source_path, study_uid, sop_uid, called_aet, calling_aet, remote_ip)
+    try:
+        try:
+            worker = forwarder.send_to_worker(source_path, item_id, study_uid, workers)
+        except Exception as exc:  # noqa: BLE001
+            _record_worker_result(args, None, str(exc), isinstance(exc, ForwardError))
+        else:
+            _record_worker_result(args, worker, None)
+    finally:
+        release_connection()
+
+
+def _send_worker_batch(batch: List[tuple], workers: Optional[FrozenSet[str]] = None) -> None:
+    forwarder = _get_forwarder()
+    try:
+        try:
+            worker, errors = forwarder.send_batch_to_worker(
+                [args[1] for args in batch],
+                [args[0] for args in batch],
+                batch[0][2],
+                workers,
+            )
+        except ForwardError as exc:
+            worker, errors = None, [str(exc)] * len(batch)
+        for args, error in zip(batch, errors):
+            _record_worker_result(args, worker, error)
+    finally:
+        release_connection()
+
+
+def _record_worker_result(args: tuple, worker: dict | None, error: str | None, forward_error: bool = True) -> None:
+    item_id, _, study_uid, sop_uid, called_aet, calling_aet, remote_ip = args
+    if error is None:
         log_event(
-            "error",
+            "info",
             "forward_worker",
             study_uid=study_uid,
             sop_uid=sop_uid,
             ae_title=called_aet,
             calling_aet=calling_aet,
+            worker=worker,
             remote_ip=remote_ip,
-            outcome="failed",
-            error=message,
+            outcome="sent",
+            error=None,
         )
+        return
+    status = AI_STATUS_TIMEOUT if forward_error and "timeout" in error else AI_STATUS_FAILED
+    write_behind.submit(mark_ai_status, item_id, status, error)
+    log_event(
+        "error",
+        "forward_worker",
+        study_uid=study_uid,
+        sop_uid=sop_uid,
+        ae_title=called_aet,
+        calling_aet=calling_aet,
+        remote_ip=remote_ip,
+        outcome=status if forward_error else "failed",
+        error=error,
+    )
 
 
 def handle_store(event: evt.Event) -> int:
+    try:
+        return _handle_store(event)
+    finally:
+        release_connection()
+
+
+def _handle_store(event: evt.Event) -> int:
     config = get_config()
-    ds = event.dataset
-    ds.file_meta = event.file_meta
 
-    study_uid = getattr(ds, "StudyInstanceUID", "unknown")
-    sop_uid = getattr(ds, "SOPInstanceUID", "unknown")
+    # Filled in from the header once it has been read; a dataset that cannot be
+    # parsed is still logged and refused below.
+    study_uid = "unknown"
+    sop_uid = "unknown"
     calling_raw = event.assoc.requestor.ae_title
     if isinstance(calling_raw, bytes):
         calling_aet = calling_raw.decode(errors="ignore")
@@ -122,6 +533,10 @@ def handle_store(event: evt.Event) -> int:
     remote_ip = event.assoc.requestor.address
 
     try:
+        instance = ReceivedInstance(event)
+        study_uid = instance.header.get("StudyInstanceUID") or "unknown"
+        sop_uid = instance.header.get("SOPInstanceUID") or "unknown"
+
         allowed = config["edge"].get("allowed_calling_aets", [])
         if allowed and calling_aet not in allowed:
             log_event(
@@ -137,16 +552,47 @@ def handle_store(event: evt.Event) -> int:
             )
             return 0xA700
 
+        if _ADMISSION is not None and not _ADMISSION.admit(calling_aet):
+            log_event(
+                "warning",
+                "receive",
+                study_uid=study_uid,
+                sop_uid=sop_uid,
+                ae_title=called_aet,
+                calling_aet=calling_aet,
+                remote_ip=remote_ip,
+                outcome="shed",
+                error="out_of_resources",
+            )
+            return 0xA700
+
+        # Holding the response back throttles the sender; past max_wait it gets Out of Resources.
+        max_wait = float(config["edge"].get("ingest_rate_limit", {}).get("max_wait_seconds", 5))
+        if not _source_limit(calling_aet).acquire(timeout=max_wait):
+            log_event(
+                "warning",
+                "receive",
+                study_uid=study_uid,
+                sop_uid=sop_uid,
+                ae_title=called_aet,
+                calling_aet=calling_aet,
+                remote_ip=remote_ip,
+                outcome="rejected",
+                error="ingest_rate_limited",
+            )
+            return 0xA700
+
         apply_faults("receive")
         data_root = config["edge"]["data_root"]
         dest_dir = os.path.join(data_root, "incoming", study_uid)
         os.makedirs(dest_dir, exist_ok=True)
         dest_path = os.path.join(dest_dir, f"{sop_uid}.dcm")
         simulate_disk_full(dest_path)
-        pydicom.filewriter.dcmwrite(dest_path, ds, write_like_original=False)
+        instance.write(dest_path)
 
         forwarder_mode = str(config.get("forwarder", {}).get("mode", "dummy")).lower()
-        is_ai_result = str(getattr(ds, "SeriesDescription", "")).strip() == "AI_RESULT"
+        route = get_routing_table().route(instance.header)
+        is_ai_result = route.destination == "ai_result"
 
         _log_receive(study_uid, sop_uid, called_aet, calling_aet, remote_ip)
         log_event(
@@ -161,49 +607,50 @@ def handle_store(event: evt.Event) -> int:
             error=None,
         )
 
-        if forwarder_mode == "parallel" and is_ai_result:
-            correlation = mark_result_received(study_uid, sop_uid)
-            worker_info = None
-            duration_ms = None
-            if correlation:
-                worker_info = correlation["worker"]
-                duration_ms = correlation["duration_ms"]
-            forwarder = _get_forwarder()
-            try:
-                forwarder.send_to_orthanc(dest_path)
+        correlation = None
+        if is_ai_result:
+            original_sop_uid = instance.header.get("ReferencedSOPInstanceUID")
+            accepted, correlation = write_behind.submit(receive_result, study_uid, sop_uid, original_sop_uid, durable=True)
+            if not accepted:
+                # A hedged dispatch already produced a result for this instance.
+                try:
+                    os.remove(dest_path)
+                except OSError:
+                    pass
                 log_event(
                     "info",
-                    "ai_result",
+                    "result",
                     study_uid=study_uid,
-                    original_sop_uid=correlation["original_sop_uid"] if correlation else None,
+                    original_sop_uid=original_sop_uid,
                     result_sop_uid=sop_uid,
-                    worker=worker_info,
-                    duration_ms=duration_ms,
                     ae_title=called_aet,
                     calling_aet=calling_aet,
                     remote_ip=remote_ip,
-                    outcome="forwarded",
+                    outcome="duplicate_dropped",
                     error=None,
                 )
-            except ForwardError as exc:
+                return 0x0000
+
+        if is_ai_result:
+            if correlation:
                 log_event(
-                    "error",
-                    "ai_result",
+                    "info",
+                    "result",
                     study_uid=study_uid,
-                    original_sop_uid=correlation["original_sop_uid"] if correlation else None,
+                    original_sop_uid=correlation["original_sop_uid"],
                     result_sop_uid=sop_uid,
-                    worker=worker_info,
-                    duration_ms=duration_ms,
+                    worker=correlation["worker"],
+                    duration_ms=correlation["duration_ms"],
                     ae_title=called_aet,
                     calling_aet=calling_aet,
                     remote_ip=remote_ip,
-                    outcome="forward_failed",
-                    error=str(exc),
+                    outcome="correlated",
+                    error=None,
                 )
-            if not correlation:
+            else:
                 log_event(
                     "warning",
-                    "ai_result",
+                    "result",
                     study_uid=study_uid,
                     result_sop_uid=sop_uid,
                     ae_title=called_aet,
@@ -212,9 +659,13 @@ def handle_store(event: evt.Event) -> int:
                     outcome="unmatched",
                     error="no_original_found",
                 )
-            return 0x0000
 
-        item_id = enqueue(study_uid, sop_uid, dest_path)
+        lane = _get_priority_rules().classify(instance.header, getattr(event.request, "Priority", None))
+        # Parallel-mode PACS forwards acknowledged before delivery are tracked per process for recovery.
+        pacs_owner = _PACS_OWNER if forwarder_mode == "parallel" and _pacs_ack_mode() == "durable" else None
+        item_id = write_behind.submit(
+            enqueue_and_notify, study_uid, sop_uid, dest_path, instance.header, pacs_owner, lane, durable=True
+        )
         log_event(
             "info",
             "queue",
@@ -223,78 +674,28 @@ def handle_store(event: evt.Event) -> int:
             ae_title=called_aet,
             calling_aet=calling_aet,
             remote_ip=remote_ip,
+            lane=lane,
             outcome="queued",
             error=None,
         )
 
-        if forwarder_mode == "parallel" and not is_ai_result:
-            forwarder = _get_forwarder()
-            try:
-                forwarder.send_to_orthanc(dest_path)
-                mark_pacs_sent(item_id)
-                update_state(item_id, STATE_SENT)
-                log_event(
-                    "info",
-                    "forward_pacs",
-                    study_uid=study_uid,
-                    sop_uid=sop_uid,
-                    ae_title=called_aet,
-                    calling_aet=calling_aet,
-                    remote_ip=remote_ip,
-                    outcome="sent",
-                    error=None,
-                )
-            except ForwardError as exc:
-                update_state(item_id, STATE_FAILED, last_error=str(exc))
-                log_event(
-                    "error",
-                    "forward_pacs",
-                    study_uid=study_uid,
-                    sop_uid=sop_uid,
-                    ae_title=called_aet,
-                    calling_aet=calling_aet,
-                    remote_ip=remote_ip,
-                    outcome="failed",
-                    error=str(exc),
-                )
-
-            worker_thread = threading.Thread(
-                target=_send_worker_async,
-                args=(item_id, dest_path, study_uid, sop_uid, called_aet, calling_aet, remote_ip),
-                daemon=True,
-            )
-            worker_thread.start()
+        # AI results take the same PACS path as any other instance: staged, retried
+        # through the outbox and tracked in pacs_pending while the breaker is open.
+        if forwarder_mode == "parallel":
+            args = (item_id, dest_path, study_uid, sop_uid, called_aet, calling_aet, remote_ip)
+            batcher = _get_batcher()
+            if batcher is not None:
+                batcher.add(_batch_key(lane, route, study_uid, instance.header), args)
+                return 0x0000
+            if _pacs_ack_mode() == "durable":
+                _get_pacs_stage().submit(_forward_pacs, *args, lane, lane=lane, flow=calling_aet)
+            else:
+                _forward_pacs(*args, lane)
+            # Instances routed to orthanc only are never spent on a worker.
+            if route.destination == "workers":
+                _dispatch_worker(*args, lane=lane, workers=route.workers)
             return 0x0000
 
-        if is_ai_result:
-            correlation = mark_result_received(study_uid, sop_uid)
-            if correlation:
-                log_event(
-                    "info",
-                    "result",
-                    study_uid=study_uid,
-                    original_sop_uid=correlation["original_sop_uid"],
-                    result_sop_uid=sop_uid,
-                    worker=correlation["worker"],
-                    duration_ms=correlation["duration_ms"],
-                    ae_title=called_aet,
-                    calling_aet=calling_aet,
-                    remote_ip=remote_ip,
-                    outcome="correlated",
-                    error=None,
-                )
-            else:
-                log_event(
-                    "warning",
-                    "result",
-                    study_uid=study_uid,
-                    result_sop_uid=sop_uid,
-                    ae_title=called_aet,
-                    calling_aet=calling_aet,
-                    remote_ip=remote_ip,
-                    outcome="unmatched",
-                    error="no_original_found",
-                )
         return 0x0000
     except FaultError as exc:
         log_event(
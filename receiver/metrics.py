@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from receiver.config import get_config
+
+
+_PROVIDERS: Dict[str, Callable[[], Any]] = {}
+_LOCK = threading.Lock()
+_PUBLISHER: Optional[threading.Thread] = None
+_PROCESS_NAME: Optional[str] = None
+
+
+class RateMeter:
+    def __init__(self, window_seconds: int = 60) -> None:
+        self.window_seconds = window_seconds
+        self._buckets: Deque[List[int]] = deque()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def mark(self, count: int = 1) -> None:
+        second = int(time.monotonic())
+        with self._lock:
+            self._total += count
+            if self._buckets and self._buckets[-1][0] == second:
+                self._buckets[-1][1] += count
+            else:
+                self._buckets.append([second, count])
+            self._trim(second)
+
+    def stats(self) -> Dict[str, Any]:
+        now = int(time.monotonic())
+        with self._lock:
+            self._trim(now)
+            last_10s = sum(count for second, count in self._buckets if now - second < 10)
+            window = sum(count for _, count in self._buckets)
+            return {
+                "total": self._total,
+                "per_second_10s": round(last_10s / 10.0, 2),
+                f"per_second_{self.window_seconds}s": round(window / float(self.window_seconds), 2),
+            }
+
+    def _trim(self, now: int) -> None:
+        while self._buckets and now - self._buckets[0][0] >= self.window_seconds:
+            self._buckets.popleft()
+
+
+def register(name: str, provider: Callable[[], Any]) -> None:
+    with _LOCK:
+        _PROVIDERS[name] = provider
+
+
+def snapshot() -> Dict[str, Any]:
+    with _LOCK:
+        providers = dict(_PROVIDERS)
+    result: Dict[str, Any] = {"timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z", "pid": os.getpid()}
+    for name, provider in providers.items():
+        try:
+            result[name] = provider()
+        except Exception as exc:  # noqa: BLE001
+            result[name] = {"error": str(exc)}
+    return result
+
+
+def set_process_name(name: str) -> None:
+    global _PROCESS_NAME
+    _PROCESS_NAME = name
+
+
+def metrics_path() -> str:
+    filename = f"metrics-{_PROCESS_NAME}.json" if _PROCESS_NAME else "metrics.json"
+    return os.path.join(get_config()["edge"]["data_root"], filename)
+
+
+def _published_files() -> List[str]:
+    data_root = get_config()["edge"]["data_root"]
+    try:
+        names = os.listdir(data_root)
+    except OSError:
+        return []
+    return sorted(os.path.join(data_root, name) for name in names if name.startswith("metrics") and name.endswith(".json"))
+
+
+def clear_published() -> None:
+    for path in _published_files():
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def publish() -> None:
+    path = metrics_path()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, separators=(",", ":"), default=str)
+    os.replace(tmp_path, path)
+
+
+def start_publisher(interval_seconds: float) -> None:
+    global _PUBLISHER
+    if _PUBLISHER is not None:
+        return
+
+    def _loop() -> None:
+        while True:
+            time.sleep(interval_seconds)
+            try:
+                publish()
+            except OSError:
+                pass
+
+    _PUBLISHER = threading.Thread(target=_loop, daemon=True)
+    _PUBLISHER.start()
+
+
+def read_published() -> Optional[Dict[str, Any]]:
+    published: Dict[str, Any] = {}
+    for path in _published_files():
+        name = os.path.basename(path)[len("metrics"):-len(".json")].lstrip("-") or "main"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                published[name] = json.load(f)
+        except (OSError, ValueError):
+            continue
+    if not published:
+        return None
+    if list(published) == ["main"]:
+        return published["main"]
+    return {"processes": published}
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from typing import Any, BinaryIO, Dict, Optional
+
+from pydicom import dcmread
+from pydicom.filebase import DicomBytesIO
+from pydicom.filewriter import write_file_meta_info
+from pynetdicom import _config, evt
+
+
+HEADER_KEYWORDS = [
+    "SOPClassUID",
+    "SOPInstanceUID",
+    "StudyInstanceUID",
+    "SeriesInstanceUID",
+    "Modality",
+    "SeriesDescription",
+    "StudyDescription",
+    "PatientID",
+]
+
+# AI results reference the instance they were computed from; hedged dispatch
+# relies on it to keep only the first result per original instance.
+REFERENCE_SEQUENCE = "ReferencedImageSequence"
+
+
+class ReceivedInstance:
+    def __init__(self, event: evt.Event) -> None:
+        self._event = event
+        self._source_path: Optional[str] = None
+        self._encoded: Optional[bytes] = None
+        if _config.STORE_RECV_CHUNKED_DATASET:
+            self._source_path = str(event.dataset_path)
+        else:
+            self._encoded = _encode_with_meta(event)
+        self.header = self._read_header()
+        if self._source_path is not None:
+            self.header["FileSize"] = os.path.getsize(self._source_path)
+        else:
+            self.header["FileSize"] = len(self._encoded or b"")
+
+    def write(self, dest_path: str) -> None:
+        tmp_path = f"{dest_path}.part"
+        if self._source_path is not None:
+            shutil.move(self._source_path, tmp_path)
+        else:
+            with open(tmp_path, "wb") as f:
+                f.write(self._encoded or b"")
+            self._encoded = None
+        os.replace(tmp_path, dest_path)
+
+    def _read_header(self) -> Dict[str, Any]:
+        if self._source_path is not None:
+            with open(self._source_path, "rb") as f:
+                return _parse_header(f)
+        return _parse_header(BytesIO(self._encoded or b""))
+
+
+def use_chunk_dir(data_root: str) -> None:
+    # pynetdicom writes chunked datasets through NamedTemporaryFile; keeping them
+    # on the data_root filesystem makes the move into incoming/ a plain rename.
+    chunk_dir = os.path.join(data_root, "incoming", ".chunks")
+    os.makedirs(chunk_dir, exist_ok=True)
+    tempfile.tempdir = chunk_dir
+
+
+def _encode_with_meta(event: evt.Event) -> bytes:
+    # Same layout pynetdicom writes in chunked mode: preamble, DICM, file meta,
+    # then the data set exactly as received.
+    fp = DicomBytesIO()
+    fp.write(b"\x00" * 128 + b"DICM")
+    write_file_meta_info(fp, event.file_meta)
+    fp.write(event.request.DataSet.getvalue())
+    return fp.getvalue()
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        header = _parse_header(f)
+    header["FileSize"] = os.path.getsize(path)
+    return header
+
+
+def _parse_header(fp: BinaryIO) -> Dict[str, Any]:
+    ds = dcmread(fp, stop_before_pixels=True, specific_tags=HEADER_KEYWORDS + [REFERENCE_SEQUENCE])
+    header: Dict[str, Any] = {}
+    for keyword in HEADER_KEYWORDS:
+        value = ds.get(keyword)
+        header[keyword] = str(value).strip() if value is not None else None
+    referenced = ds.get(REFERENCE_SEQUENCE)
+    referenced_uid = referenced[0].get("ReferencedSOPInstanceUID") if referenced else None
+    header["ReferencedSOPInstanceUID"] = str(referenced_uid).strip() if referenced_uid else None
+    file_meta = getattr(ds, "file_meta", None)
+    transfer_syntax = file_meta.get("TransferSyntaxUID") if file_meta is not None else None
+    header["TransferSyntaxUID"] = str(transfer_syntax) if transfer_syntax else None
+    return header
@@ -2,7 +2,7 @@ import datetime
 import os
 import time
 
-from pydicom.dataset import FileDataset, FileMetaDataset
+from pydicom.dataset import Dataset, FileDataset, FileMetaDataset
 from pydicom.uid import ExplicitVRLittleEndian, PYDICOM_IMPLEMENTATION_UID, SecondaryCaptureImageStorage as SecondaryCaptureImageStorageUID, generate_uid
 from pynetdicom import AE, evt
 from pynetdicom.sop_class import CTImageStorage, MRImageStorage, SecondaryCaptureImageStorage
@@ -36,6 +36,12 @@ def _build_result(ds_in) -> FileDataset:
     ds.PatientID = getattr(ds_in, "PatientID", "UNKNOWN")
     ds.Modality = "OT"
     ds.SeriesDescription = "AI_RESULT"
+    source_uid = getattr(ds_in, "SOPInstanceUID", None)
+    if source_uid:
+        reference = Dataset()
+        reference.ReferencedSOPClassUID = getattr(ds_in, "SOPClassUID", "")
+        reference.ReferencedSOPInstanceUID = source_uid
+        ds.ReferencedImageSequence = [reference]
     ds.StudyDate = now.strftime("%Y%m%d")
     ds.StudyTime = now.strftime("%H%M%S")
     ds.Rows = 1